@@ -1,6 +1,7 @@
 """CLI command entry point."""
 import os
 import sys
+import stat
 import logging
 
 try:
@@ -14,20 +15,44 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _check_directory(path: str, label: str) -> bool:
+    """
+    Check that a path exists and is a directory using a single stat call.
+    
+    Args:
+        path: Path to check
+        label: Human readable name used in error messages
+        
+    Returns:
+        True if the path is a directory, False otherwise (error is logged)
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        logger.error(f"{label} does not exist: {path}")
+        return False
+    except OSError as e:
+        # e.g. a path component is a file, or a parent directory is not searchable
+        logger.error(f"{label} is not accessible: {path} ({e.strerror})")
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        logger.error(f"{label} is not a directory: {path}")
+        return False
+    return True
+
+
 def main():
     """CLI command entry point."""
     # Initialize config (configures logging)
     config = Config()
     
     # Validate that required paths exist
-    if not os.path.exists(config.REPO_ROOT):
-        logger.error(f"Repository root does not exist: {config.REPO_ROOT}")
+    if not _check_directory(config.REPO_ROOT, "Repository root"):
         sys.exit(1)
 
     # Context root is optional - only validate if set
     context_root = config.CONTEXT_ROOT if config.CONTEXT_ROOT else None
-    if context_root and not os.path.exists(context_root):
-        logger.error(f"Context root does not exist: {context_root}")
+    if context_root and not _check_directory(context_root, "Context root"):
         sys.exit(1)
 
     try:
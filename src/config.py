@@ -37,8 +37,16 @@ class Config:
         >>> config = Config()
         >>> print(config.REPO_ROOT)
         /workspace/repo
+        >>> Config.get() is config
+        True
     """
 
+    # Most recently constructed instance, shared through Config.get()
+    _instance = None
+
+    # Logging level installed by configure_logging, None until logging is configured
+    _logging_level = None
+
     def __init__(self):
         """
         Initialize the Config instance.
@@ -59,6 +67,12 @@ class Config:
         self.LLM_API_KEY = ''
         self.LLM_TEMPERATURE = 0.0
         self.LLM_MAX_TOKENS = 0
+        self.LLM_MAX_PARALLEL = 0
+        self.IO_PARALLEL = 0
+        self.LLM_CACHE_DIR = ''
+        self.LLM_CACHE_TTL = 0
+        self.CACHE_LLM_RESULTS = False
+        self.LLM_HTTP2 = True
 
         # Default Values grouped by value type            
         self.config_strings = {
@@ -69,11 +83,20 @@ class Config:
             "LLM_PROVIDER": "null",  # null, ollama, openai, azure
             "LLM_MODEL": "codellama",
             "LLM_BASE_URL": "http://localhost:11434",
+            "LLM_CACHE_DIR": "~/.cache/stage0_runbook_llm",
         }
         
         self.config_ints = {
             "LLM_TEMPERATURE": "7",  # Stored as int (70 = 0.7), converted to float in accessor
             "LLM_MAX_TOKENS": "8192",
+            "LLM_MAX_PARALLEL": "8",  # Concurrent requests in LLMClient.complete_many
+            "LLM_CACHE_TTL": "0",  # Seconds a cached LLM response stays valid, 0 = forever
+            "IO_PARALLEL": "16",  # Threads reading context and repo files
+        }
+
+        self.config_booleans = {
+            "CACHE_LLM_RESULTS": "false",  # Reuse LLM responses for identical requests (temperature 0 only)
+            "LLM_HTTP2": "true",  # HTTP/2 for openai/azure providers (needs the h2 package)
         }
 
         self.config_string_secrets = {  
@@ -83,6 +106,23 @@ class Config:
         # Initialize configuration
         self.initialize()
         self.configure_logging()
+        Config._instance = self
+
+    @classmethod
+    def get(cls) -> "Config":
+        """
+        Get the shared Config instance, constructing it on first use.
+        
+        Constructing Config() re-reads every environment variable and
+        reconfigures logging; hot paths should use Config.get() so that
+        work is only done once per process.
+        
+        Returns:
+            The most recently constructed Config instance
+        """
+        if cls._instance is None:
+            cls()
+        return cls._instance
 
     def initialize(self):
         """
@@ -95,7 +135,8 @@ class Config:
         The method processes configuration in the following order:
         1. String configurations
         2. Integer configurations (converted to int)
-        3. String secret configurations
+        3. Boolean configurations ("true" is True, anything else False)
+        4. String secret configurations
         
         Each configuration value is tracked in config_items with its source
         (environment, or default) and value (secrets are masked).
@@ -112,6 +153,11 @@ class Config:
             value = int(self._get_config_value(key, default, False))
             setattr(self, key, value)
             
+        # Initialize Config Booleans
+        for key, default in self.config_booleans.items():
+            value = self._get_config_value(key, default, False).lower() == "true"
+            setattr(self, key, value)
+            
         # Initialize String Secrets
         for key, default in self.config_string_secrets.items():
             value = self._get_config_value(key, default, True)
@@ -123,9 +169,11 @@ class Config:
         """
         Configure Python logging based on the LOG_LEVEL configuration.
         
-        This method is called once during Config initialization to set up
+        This method is called during Config initialization to set up
         Python logging with the configured level and format. It uses force=True to
         ensure logging is properly configured even if handlers already exist.
+        Handlers are only rebuilt when the level differs from the one already
+        installed by a previous Config, so repeated construction is cheap.
         
         The logging format includes timestamp, level, logger name, and message.
         
@@ -141,16 +189,24 @@ class Config:
             logging_level = logging.INFO
             self.LOG_LEVEL = logging_level
         
-        # Configure logging with force=True (requires Python 3.8+)
-        logging.basicConfig(
-            level=logging_level,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-            force=True
-        )
+        # Handlers are installed once per process; only reconfigure when the level changes
+        # or when something else has since reset the root logger
+        if (
+            Config._logging_level != logging_level
+            or logging.root.level != logging_level
+            or not logging.root.handlers
+        ):
+            # Configure logging with force=True (requires Python 3.8+)
+            logging.basicConfig(
+                level=logging_level,
+                format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+                force=True
+            )
 
-        # Ensure root logger level is set (child loggers inherit this)
-        logging.root.setLevel(logging_level)
+            # Ensure root logger level is set (child loggers inherit this)
+            logging.root.setLevel(logging_level)
+            Config._logging_level = logging_level
 
         # Log configuration initialization
         logger.info(f"Configuration Initialized: {self.config_items}")
@@ -182,9 +238,10 @@ class Config:
         value = default_value
         from_source = "default"
 
-        # Check for environment variable
-        if os.getenv(name):
-            value = os.getenv(name)
+        # Check for environment variable (single lookup; empty values fall back to default)
+        env_value = os.environ.get(name)
+        if env_value:
+            value = env_value
             from_source = "environment"
 
         # Record the source of the config value
@@ -212,6 +269,9 @@ class Config:
         # Check config_ints
         if name in self.config_ints:
             return int(self.config_ints[name])
+        # Check config_booleans
+        if name in self.config_booleans:
+            return self.config_booleans[name].lower() == "true"
         # Check config_strings
         if name in self.config_strings:
             return self.config_strings[name]
@@ -1,22 +1,57 @@
 """Main executor that orchestrates task execution."""
+import io
 import os
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Mapping, Set, TYPE_CHECKING
 
 try:
-    from .llm_provider import LLMClient, create_llm_client
-    from .task_loader import TaskLoader
+    from .config import Config
+    from .task_loader import load_task, load_context_files, load_repo_files, substitute_variables
     from .repo_reader import RepoReader
     from .patch_generator import parse_patch_response
 except ImportError:
     # Handle direct import (when PYTHONPATH=./src and running as module)
-    from llm_provider import LLMClient, create_llm_client
-    from task_loader import TaskLoader
+    from config import Config
+    from task_loader import load_task, load_context_files, load_repo_files, substitute_variables
     from repo_reader import RepoReader
     from patch_generator import parse_patch_response
 
+if TYPE_CHECKING:
+    try:
+        from .llm_provider import LLMClient
+    except ImportError:
+        # Handle direct import (when PYTHONPATH=./src and running as module)
+        from llm_provider import LLMClient
+
 logger = logging.getLogger(__name__)
 
+# Output format instructions appended to every system prompt
+_OUTPUT_FORMAT_BLOCK = """
+Output format:
+1. Start with ---COMMIT_MSG---
+2. Provide a commit message (conventional commits format)
+3. Follow with ---PATCH---
+4. Provide a git unified diff patch starting from the repository root
+5. The patch must be valid and apply cleanly
+
+Example:
+---COMMIT_MSG---
+feat(api): generate OpenAPI specification
+
+- Adds openapi.yaml using org-standard conventions
+- Includes pagination, error envelope, and auth scheme
+---PATCH---
+diff --git a/openapi.yaml b/openapi.yaml
+new file mode 100644
+index 0000000..abc1234
+--- /dev/null
++++ b/openapi.yaml
+@@ -0,0 +1,10 @@
++openapi: 3.1.0
++...
+"""
+
 
 class Executor:
     """Main executor that runs LLM tasks."""
@@ -27,7 +62,7 @@ class Executor:
         task_name: str,
         context_root: str = None,
         task_variables: Dict[str, str] = None,
-        llm_client: LLMClient = None
+        llm_client: "LLMClient" = None
     ) -> tuple[str, str]:
         """
         Execute a task and return (commit_message, patch).
@@ -40,14 +75,23 @@ class Executor:
             llm_client: Optional LLM client (uses Config defaults if not provided)
         """
         task_variables = task_variables or {}
-        llm_client = llm_client or create_llm_client()
+        owns_client = llm_client is None
+        if llm_client is None:
+            # Deferred so callers that supply a client never import the provider module
+            try:
+                from .llm_provider import create_llm_client
+            except ImportError:
+                # Handle direct import (when PYTHONPATH=./src and running as module)
+                from llm_provider import create_llm_client
+            llm_client = create_llm_client()
         
         # Load task definition (searches repo/tasks first, then context/tasks)
-        task = TaskLoader.load_task(repo_root, task_name, context_root)
+        task = load_task(repo_root, task_name, context_root)
         logger.info(f"Loaded task: {task_name}")
 
-        # Validate and load required environment variables
-        env_vars = Executor._load_environment_variables(task)
+        # Validate and load required environment variables from a single environment snapshot
+        env_snapshot = dict(os.environ)
+        env_vars = Executor._load_environment_variables(task, env_snapshot)
         if env_vars:
             logger.info(f"Loaded {len(env_vars)} environment variables for task")
         
@@ -57,20 +101,40 @@ class Executor:
         
         task_variables = env_vars
 
+        config = Config.get()
+
         # Load context and repo files
+        load_context = bool(task.get("context"))
+        load_repo = bool(task.get("repo"))
+        if load_context and not context_root:
+            raise ValueError(
+                f"Task requires context files but CONTEXT_ROOT is not set. "
+                f"Task specifies context paths: {task['context']}"
+            )
+
         context_files = {}
-        if "context" in task and task["context"]:
-            if not context_root:
-                raise ValueError(
-                    f"Task requires context files but CONTEXT_ROOT is not set. "
-                    f"Task specifies context paths: {task['context']}"
+        if load_context and load_repo:
+            # Both loaders are I/O bound, so overlap them on two threads
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                context_future = pool.submit(
+                    load_context_files, context_root, task["context"], task_variables, config.IO_PARALLEL
                 )
-            context_files.update(TaskLoader.load_context_files(context_root, task["context"], task_variables))
+                repo_future = pool.submit(
+                    load_repo_files, repo_root, task["repo"], task_variables, config.IO_PARALLEL
+                )
+                context_files.update(context_future.result())
+                logger.info(f"Loaded {len(task['context'])} context file paths")
+                context_files.update(repo_future.result())
+                logger.info(f"Loaded {len(task['repo'])} repo file paths")
+        elif load_context:
+            context_files.update(
+                load_context_files(context_root, task["context"], task_variables, config.IO_PARALLEL)
+            )
             logger.info(f"Loaded {len(task['context'])} context file paths")
-        
-        if "repo" in task and task["repo"]:
-            repo_files = TaskLoader.load_repo_files(repo_root, task["repo"], task_variables)
-            context_files.update(repo_files)
+        elif load_repo:
+            context_files.update(
+                load_repo_files(repo_root, task["repo"], task_variables, config.IO_PARALLEL)
+            )
             logger.info(f"Loaded {len(task['repo'])} repo file paths")
         
         if context_files:
@@ -80,23 +144,23 @@ class Executor:
         system_prompt = Executor._build_system_prompt(task, context_files)
         
         # Build user prompt with repo context
-        user_prompt = Executor._build_user_prompt(repo_root, task, task_variables)
+        # Repo files already included in full need no preview in the user prompt
+        loaded_repo_paths = {path[len("repo:"):] for path in context_files if path.startswith("repo:")}
+        user_prompt = Executor._build_user_prompt(repo_root, task, task_variables, loaded_repo_paths)
 
         # Execute LLM call
-        try:
-            from .config import Config
-        except ImportError:
-            # Handle direct import (when PYTHONPATH=./src and running as module)
-            from config import Config
-        config = Config()
-        
         logger.info("Executing LLM task...")
-        response = llm_client.complete(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            temperature=config.get_llm_temperature(),
-            max_tokens=config.LLM_MAX_TOKENS
-        )
+        try:
+            response = llm_client.complete(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=config.get_llm_temperature(),
+                max_tokens=config.LLM_MAX_TOKENS
+            )
+        finally:
+            # Release pooled connections of a client this call created
+            if owns_client and hasattr(llm_client, "close"):
+                llm_client.close()
 
         # Parse response into commit message and patch
         commit_message, patch = parse_patch_response(response)
@@ -107,59 +171,46 @@ class Executor:
     @staticmethod
     def _build_system_prompt(task: Dict[str, Any], context_files: Dict[str, str]) -> str:
         """Build the system prompt from task definition and context."""
-        prompt_parts = []
+        # Each section is terminated by a newline; the output format block is always last
+        buf = io.StringIO()
 
         # Add task description
         if "description" in task:
-            prompt_parts.append(f"Task: {task['description']}")
+            buf.write("Task: ")
+            buf.write(str(task["description"]))
+            buf.write("\n")
         
         # Add guarantees/requirements
         if "guarantees" in task:
-            prompt_parts.append("\nRequirements:")
+            buf.write("\nRequirements:\n")
             for guarantee in task["guarantees"]:
-                prompt_parts.append(f"- {guarantee}")
+                buf.write("- ")
+                buf.write(str(guarantee))
+                buf.write("\n")
 
         # Add context files
         if context_files:
-            prompt_parts.append("\nContext:")
+            buf.write("\nContext:\n")
             for path, content in context_files.items():
-                prompt_parts.append(f"\n--- {path} ---\n{content}")
+                buf.write("\n--- ")
+                buf.write(path)
+                buf.write(" ---\n")
+                buf.write(content)
+                buf.write("\n")
 
         # Add output format instructions
-        prompt_parts.append("""
-Output format:
-1. Start with ---COMMIT_MSG---
-2. Provide a commit message (conventional commits format)
-3. Follow with ---PATCH---
-4. Provide a git unified diff patch starting from the repository root
-5. The patch must be valid and apply cleanly
+        buf.write(_OUTPUT_FORMAT_BLOCK)
 
-Example:
----COMMIT_MSG---
-feat(api): generate OpenAPI specification
-
-- Adds openapi.yaml using org-standard conventions
-- Includes pagination, error envelope, and auth scheme
----PATCH---
-diff --git a/openapi.yaml b/openapi.yaml
-new file mode 100644
-index 0000000..abc1234
---- /dev/null
-+++ b/openapi.yaml
-@@ -0,0 +1,10 @@
-+openapi: 3.1.0
-+...
-""")
-
-        return "\n".join(prompt_parts)
+        return buf.getvalue()
 
     @staticmethod
-    def _load_environment_variables(task: Dict[str, Any]) -> Dict[str, str]:
+    def _load_environment_variables(task: Dict[str, Any], env: Mapping[str, str] = None) -> Dict[str, str]:
         """
         Load and validate required environment variables from task definition.
         
         Args:
             task: Task definition dictionary
+            env: Optional environment snapshot (defaults to a copy of os.environ)
             
         Returns:
             Dictionary of environment variable name -> value
@@ -175,12 +226,16 @@ index 0000000..abc1234
         required_vars = task.get("environment", [])
         missing_vars = []
         
+        # Snapshot the environment once; plain dict lookups skip os.environ's per-key decoding
+        if env is None:
+            env = dict(os.environ)
+        
         for var_name in required_vars:
             if not isinstance(var_name, str):
                 logger.warning(f"Invalid environment variable name (not a string): {var_name}")
                 continue
                 
-            value = os.getenv(var_name)
+            value = env.get(var_name)
             if value is None:
                 missing_vars.append(var_name)
             else:
@@ -195,33 +250,49 @@ index 0000000..abc1234
         return env_vars
 
     @staticmethod
-    def _build_user_prompt(repo_root: str, task: Dict[str, Any], variables: Dict[str, str]) -> str:
-        """Build the user prompt with repository context."""
+    def _build_user_prompt(
+        repo_root: str,
+        task: Dict[str, Any],
+        variables: Dict[str, str],
+        loaded_repo_paths: Set[str] = None
+    ) -> str:
+        """
+        Build the user prompt with repository context.
+        
+        Args:
+            repo_root: Repository root path
+            task: Task definition dictionary
+            variables: Variables for {KEY} substitution in the task content
+            loaded_repo_paths: Repo-relative paths whose full content is already in
+                the system prompt; previews of these inputs are skipped
+        """
         prompt_parts = []
 
         # Add variable substitutions
-        task_content = task.get("content", "")
-        for key, value in variables.items():
-            task_content = task_content.replace(f"{{{key}}}", value)
+        task_content = substitute_variables(task.get("content", ""), variables)
 
         if task_content:
             prompt_parts.append(f"Instructions:\n{task_content}")
 
         # Add repository structure
-        repo_structure = RepoReader.get_repo_structure(repo_root, max_depth=2)
-        if repo_structure:
-            import json
-            structure_str = json.dumps(repo_structure, indent=2)
+        structure_str = RepoReader.render_repo_structure(repo_root, max_depth=2)
+        if structure_str:
             prompt_parts.append(f"\nRepository structure:\n{structure_str}")
 
         # Add file content hints if specified
         if "inputs" in task:
             prompt_parts.append("\nRelevant repository files:")
+            # Normalize so "/a/b.txt", "a/b.txt" and "a/./b.txt" count as the same file
+            skip_paths = {os.path.normpath(path.lstrip("/")) for path in loaded_repo_paths or ()}
             for file_path in task["inputs"]:
+                normalized_path = os.path.normpath(file_path.lstrip("/"))
+                if normalized_path in skip_paths:
+                    logger.debug(f"Skipping duplicate input preview: {file_path}")
+                    continue
+                skip_paths.add(normalized_path)
                 try:
-                    content = RepoReader.read_file(repo_root, file_path)
                     # Only include first 500 chars to avoid token limits
-                    preview = content[:500] + "..." if len(content) > 500 else content
+                    preview = RepoReader.read_file_preview(repo_root, file_path, max_chars=500)
                     prompt_parts.append(f"\n--- {file_path} ---\n{preview}")
                 except FileNotFoundError:
                     logger.warning(f"Input file not found: {file_path}")
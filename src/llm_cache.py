@@ -0,0 +1,172 @@
+"""Persistent response cache for LLM clients."""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_prompt(text: str) -> str:
+    """
+    Normalize a prompt for cache keying.
+    
+    Line endings, trailing whitespace on each line and surrounding blank lines
+    do not change what is being asked, so prompts differing only in those
+    share a cache entry. Indentation and all other content are kept.
+    """
+    lines = text.replace("\r\n", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+class CachedLLMClient:
+    """
+    LLM client decorator that stores responses on disk.
+
+    Responses are kept in a SQLite database in cache_dir, keyed by a BLAKE2b hash
+    of (model, system_prompt, user_prompt, temperature, max_tokens). Identical
+    requests are answered from the cache without calling the wrapped client;
+    prompts are compared after _normalize_prompt, so whitespace-only
+    differences still hit.
+
+    Only use this for deterministic requests (temperature 0); at higher
+    temperatures a cache would pin one sample forever.
+    """
+
+    DB_NAME = "responses.sqlite3"
+
+    def __init__(self, client, model: str, cache_dir: str, ttl_seconds: int = 0):
+        """
+        Args:
+            client: The LLMClient to wrap
+            model: Model name, part of the cache key
+            cache_dir: Directory holding the cache database (~ is expanded)
+            ttl_seconds: Maximum age of a cached response; 0 keeps entries forever
+        """
+        self.client = client
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, self.DB_NAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> str:
+        """Hash everything that determines the response into a cache key."""
+        key_material = json.dumps({
+            "model": self.model,
+            "system_prompt": _normalize_prompt(system_prompt),
+            "user_prompt": _normalize_prompt(user_prompt),
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }, sort_keys=True)
+        return hashlib.blake2b(key_material.encode("utf-8"), digest_size=32).hexdigest()
+
+    def _get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        response, created = row
+        if self.ttl_seconds and time.time() - created > self.ttl_seconds:
+            return None
+        return response
+
+    def _put(self, key: str, response: str):
+        """Store a response for a key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            self._conn.commit()
+
+    def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> str:
+        """Return the cached response, or complete with the wrapped client and cache it."""
+        key = self._key(system_prompt, user_prompt, temperature, max_tokens)
+        cached = self._get(key)
+        if cached is not None:
+            logger.info("Using cached LLM response")
+            return cached
+
+        response = self.client.complete(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        self._put(key, response)
+        return response
+
+    def complete_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> Iterator[str]:
+        """Yield the cached response, or stream from the wrapped client and cache the result."""
+        key = self._key(system_prompt, user_prompt, temperature, max_tokens)
+        cached = self._get(key)
+        if cached is not None:
+            logger.info("Using cached LLM response")
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.client.complete_stream(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens
+        ):
+            chunks.append(chunk)
+            yield chunk
+        self._put(key, "".join(chunks))
+
+    def complete_many(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> List[str]:
+        """Answer cached prompts from disk and send only the misses to the wrapped client."""
+        keys = [self._key(system, user, temperature, max_tokens) for system, user in prompts]
+        responses = [self._get(key) for key in keys]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if missing:
+            fresh = self.client.complete_many(
+                [prompts[i] for i in missing], temperature=temperature, max_tokens=max_tokens
+            )
+            for i, response in zip(missing, fresh):
+                self._put(keys[i], response)
+                responses[i] = response
+        logger.info(f"LLM response cache: {len(prompts) - len(missing)} hits, {len(missing)} misses")
+        return responses
+
+    def close(self):
+        """Close the wrapped client (if it supports it) and the cache database."""
+        if hasattr(self.client, "close"):
+            self.client.close()
+        with self._lock:
+            self._conn.close()
@@ -1,11 +1,38 @@
 """LLM Provider abstraction and implementations."""
-from typing import Protocol
+from typing import Iterator, List, Optional, Protocol, Tuple
 import os
+import sys
+import json
+import time
+import random
+import asyncio
 import logging
+import importlib.util
+from abc import ABC, abstractmethod
+
+try:
+    from .config import Config
+    from .llm_cache import CachedLLMClient
+except ImportError:
+    # Handle direct import (when PYTHONPATH=./src and running as module)
+    from config import Config
+    from llm_cache import CachedLLMClient
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON decoding of provider responses
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _loads(data):
+    """Decode JSON from str or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class LLMClient(Protocol):
     """Protocol for LLM providers."""
 
@@ -19,6 +46,40 @@ class LLMClient(Protocol):
         """Complete a prompt and return the response."""
         ...
 
+    def complete_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> Iterator[str]:
+        """Complete a prompt, yielding the response text as it is generated."""
+        ...
+
+    def complete_many(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> List[str]:
+        """Complete several (system_prompt, user_prompt) pairs, returning responses in order."""
+        ...
+
+
+# Canned reply of NullLLMClient: a valid commit message and patch for test.txt
+_NULL_RESPONSE = (
+    "---COMMIT_MSG---\n"
+    "feat: mock change\n"
+    "---PATCH---\n"
+    "diff --git a/test.txt b/test.txt\n"
+    "new file mode 100644\n"
+    "index 0000000..1234567\n"
+    "--- /dev/null\n"
+    "+++ b/test.txt\n"
+    "@@ -0,0 +1 @@\n"
+    "+mock content\n"
+)
+
 
 class NullLLMClient:
     """Null/dry-run LLM client for testing."""
@@ -32,16 +93,108 @@ class NullLLMClient:
     ) -> str:
         """Return a mock response."""
         logger.info("NullLLMClient: Returning mock response")
-        return "---COMMIT_MSG---\nfeat: mock change\n---PATCH---\ndiff --git a/test.txt b/test.txt\nnew file mode 100644\nindex 0000000..1234567\n--- /dev/null\n+++ b/test.txt\n@@ -0,0 +1 @@\n+mock content\n"
+        return _NULL_RESPONSE
 
+    def complete_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> Iterator[str]:
+        """Yield the mock response as a single chunk."""
+        yield self.complete(system_prompt, user_prompt, temperature, max_tokens)
 
-class OllamaClient:
-    """Ollama LLM client implementation."""
+    def complete_many(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> List[str]:
+        """Return a mock response for each prompt."""
+        return [self.complete(system, user, temperature, max_tokens) for system, user in prompts]
 
-    def __init__(self, model: str, base_url: str = "http://localhost:11434"):
-        self.model = model
-        self.base_url = base_url.rstrip('/')
-        self.api_url = f"{self.base_url}/api/generate"
+
+class _PooledHTTPClient(ABC):
+    """Base for HTTP LLM clients that reuse one httpx.Client (and its connections) across calls."""
+
+    # Connection pool settings shared by all HTTP providers
+    TIMEOUT = 300.0
+    MAX_CONNECTIONS = 100
+    MAX_KEEPALIVE_CONNECTIONS = 20
+    KEEPALIVE_EXPIRY = 30.0
+
+    # Retries for rate limits, server errors and connection failures (exponential backoff with full jitter)
+    MAX_RETRIES = 4
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 30.0
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    # Provider name used in error logs, and the API path requests are posted to
+    PROVIDER_NAME = "HTTP"
+    API_PATH = ""
+
+    base_url: str = ""
+    http2: bool = False
+    max_parallel: int = 8
+    _client = None
+
+    def _default_headers(self) -> dict:
+        """Headers sent with every request."""
+        return {}
+
+    @property
+    def client(self):
+        """The httpx.Client for this provider, created on first use."""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.Client(
+                base_url=self.base_url,
+                http2=self._http2_available(),
+                timeout=self.TIMEOUT,
+                headers=self._default_headers(),
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=self.KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
+
+    def _create_async_client(self):
+        """Create an httpx.AsyncClient with the same settings as the sync client."""
+        import httpx
+
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=self._http2_available(),
+            timeout=self.TIMEOUT,
+            headers=self._default_headers(),
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONNECTIONS,
+                max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    @abstractmethod
+    def _build_payload(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> dict:
+        """Build the JSON request body for one completion."""
+
+    @abstractmethod
+    def _parse_result(self, result: dict) -> str:
+        """Extract the completion text from a decoded JSON response."""
+
+    def _build_stream_payload(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> dict:
+        """Build the JSON request body for one streamed completion."""
+        payload = self._build_payload(system_prompt, user_prompt, temperature, max_tokens)
+        payload["stream"] = True
+        return payload
+
+    @abstractmethod
+    def _parse_stream_line(self, line: str) -> str:
+        """Extract the text delta from one line of a streamed response ("" if none)."""
 
     def complete(
         self,
@@ -50,89 +203,274 @@ class OllamaClient:
         temperature: float = 0.7,
         max_tokens: int = 4096
     ) -> str:
-        """Complete a prompt using Ollama API."""
-        import httpx
+        """Complete a prompt using the provider API (streamed, then joined)."""
+        return "".join(self.complete_stream(system_prompt, user_prompt, temperature, max_tokens))
+
+    def complete_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> Iterator[str]:
+        """
+        Complete a prompt, yielding text chunks as the provider generates them.
+        
+        Streaming starts returning text before the completion finishes, and the
+        read timeout applies between chunks rather than to the whole generation.
+        """
+        payload = self._build_stream_payload(system_prompt, user_prompt, temperature, max_tokens)
+        for attempt in range(self.MAX_RETRIES + 1):
+            # Once text has been yielded a retry would repeat it, so only retry before the first chunk
+            yielded = False
+            try:
+                with self.client.stream("POST", self.API_PATH, json=payload) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        chunk = self._parse_stream_line(line)
+                        if chunk:
+                            yielded = True
+                            yield chunk
+                return
+            except Exception as e:
+                delay = None if yielded else self._retry_delay(attempt, e)
+                if delay is None:
+                    logger.error(f"{self.PROVIDER_NAME} API error: {e}")
+                    raise
+                time.sleep(delay)
+
+    def complete_many(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> List[str]:
+        """
+        Complete several prompts concurrently, returning responses in input order.
+        
+        Requests are issued with asyncio.gather over one httpx.AsyncClient, with at
+        most max_parallel in flight. Must not be called from a running event loop.
+        
+        Args:
+            prompts: List of (system_prompt, user_prompt) pairs
+            temperature: Sampling temperature for every request
+            max_tokens: Maximum tokens per response
+            
+        Returns:
+            List of completion texts, one per prompt
+        """
+        if not prompts:
+            return []
+        return asyncio.run(self._complete_all(prompts, temperature, max_tokens))
+
+    async def _complete_all(self, prompts: List[Tuple[str, str]], temperature: float, max_tokens: int) -> List[str]:
+        """Run all completions on one async client, bounded by max_parallel."""
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel))
+        async with self._create_async_client() as async_client:
+
+            async def complete_one(system_prompt: str, user_prompt: str) -> str:
+                payload = self._build_payload(system_prompt, user_prompt, temperature, max_tokens)
+                async with semaphore:
+                    for attempt in range(self.MAX_RETRIES + 1):
+                        try:
+                            response = await async_client.post(self.API_PATH, json=payload)
+                            response.raise_for_status()
+                            return self._parse_result(_loads(response.content))
+                        except Exception as e:
+                            delay = self._retry_delay(attempt, e)
+                            if delay is None:
+                                logger.error(f"{self.PROVIDER_NAME} API error: {e}")
+                                raise
+                            await asyncio.sleep(delay)
+
+            return await asyncio.gather(*(complete_one(system, user) for system, user in prompts))
+
+    def _retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Seconds to wait before retrying a failed request, or None to give up.
+        
+        Retries 429 and 5xx responses (honouring a numeric Retry-After header) and
+        httpx transport errors such as connection resets and timeouts. Other 4xx
+        responses and parsing errors are not retried.
+        
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            error: The exception raised by the attempt
+        """
+        if attempt >= self.MAX_RETRIES:
+            return None
+
+        response = getattr(error, "response", None)
+        if response is not None:
+            if response.status_code not in self.RETRY_STATUS_CODES:
+                return None
+            retry_after = response.headers.get("Retry-After")
+            try:
+                delay = min(max(float(retry_after), 0.0), self.RETRY_MAX_DELAY)
+            except (TypeError, ValueError):
+                delay = None
+        else:
+            # An httpx exception can only exist once httpx has been imported
+            httpx = sys.modules.get("httpx")
+            if httpx is None or not isinstance(error, httpx.TransportError):
+                return None
+            delay = None
+
+        if delay is None:
+            delay = random.uniform(0, min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt))
+        logger.warning(
+            f"{self.PROVIDER_NAME} API error: {error}; retrying in {delay:.1f}s "
+            f"(attempt {attempt + 1} of {self.MAX_RETRIES})"
+        )
+        return delay
+
+    def _http2_available(self) -> bool:
+        """Whether to negotiate HTTP/2; requires the optional h2 package."""
+        if not self.http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            return False
+        return True
+
+    def close(self):
+        """Close pooled connections; the client is recreated if used again."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class OllamaClient(_PooledHTTPClient):
+    """
+    Ollama LLM client implementation.
+    
+    complete_many only overlaps requests if the server allows it; set
+    OLLAMA_NUM_PARALLEL on the Ollama server to at least LLM_MAX_PARALLEL.
+    """
+
+    PROVIDER_NAME = "Ollama"
+    API_PATH = "/api/generate"
+
+    def __init__(self, model: str, base_url: str = "http://localhost:11434", max_parallel: int = 8):
+        self.model = model
+        self.base_url = base_url.rstrip('/')
+        self.api_url = f"{self.base_url}{self.API_PATH}"
+        self.max_parallel = max_parallel
+
+    def _build_payload(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> dict:
+        """Build an Ollama generate request."""
+        return {
+            "model": self.model,
+            "prompt": f"{system_prompt}\n\n{user_prompt}",
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            }
+        }
+
+    def _parse_result(self, result: dict) -> str:
+        """Extract the generated text from an Ollama response."""
+        return result.get("response", "")
+
+    def _parse_stream_line(self, line: str) -> str:
+        """Extract the text from one NDJSON line of a streamed Ollama response."""
+        result = _loads(line)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        return result.get("response", "")
 
-        try:
-            response = httpx.post(
-                self.api_url,
-                json={
-                    "model": self.model,
-                    "prompt": f"{system_prompt}\n\n{user_prompt}",
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                        "num_predict": max_tokens,
-                    }
-                },
-                timeout=300.0
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result.get("response", "")
-        except Exception as e:
-            logger.error(f"Ollama API error: {e}")
-            raise
 
+class OpenAIClient(_PooledHTTPClient):
+    """
+    OpenAI-compatible LLM client implementation.
+    
+    The system prompt is sent first so the stable part of each request (task,
+    requirements, context files) forms the longest possible prefix for the
+    provider's automatic prompt caching; cache hits are logged per response.
+    """
 
-class OpenAIClient:
-    """OpenAI-compatible LLM client implementation."""
+    PROVIDER_NAME = "OpenAI"
+    API_PATH = "/v1/chat/completions"
 
-    def __init__(self, model: str, base_url: str, api_key: str = None):
+    def __init__(self, model: str, base_url: str, api_key: str = None, http2: bool = True, max_parallel: int = 8):
         self.model = model
         self.base_url = base_url.rstrip('/')
+        self.http2 = http2
+        self.max_parallel = max_parallel
         self.api_key = api_key or os.getenv("LLM_API_KEY")
         if not self.api_key:
             raise ValueError("LLM_API_KEY required for OpenAI client")
 
-    def complete(
-        self,
-        system_prompt: str,
-        user_prompt: str,
-        temperature: float = 0.7,
-        max_tokens: int = 4096
-    ) -> str:
-        """Complete a prompt using OpenAI-compatible API."""
-        import httpx
-
+    def _default_headers(self) -> dict:
+        """Authorization (and JSON content type for openai.com) on every request."""
         headers = {"Authorization": f"Bearer {self.api_key}"}
         if "openai.com" in self.base_url:
             headers["Content-Type"] = "application/json"
+        return headers
 
-        try:
-            response = httpx.post(
-                f"{self.base_url}/v1/chat/completions",
-                headers=headers,
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                },
-                timeout=300.0
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise
+    def _build_payload(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> dict:
+        """Build a chat completions request."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+    def _build_stream_payload(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> dict:
+        """Build a streamed chat completions request (with usage reporting on openai.com)."""
+        payload = super()._build_stream_payload(system_prompt, user_prompt, temperature, max_tokens)
+        if "openai.com" in self.base_url:
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def _log_cache_usage(self, usage: dict):
+        """Log how much of the prompt the provider served from its prefix cache."""
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+        if cached_tokens is not None:
+            logger.info(f"OpenAI prompt cache: {cached_tokens} of {usage.get('prompt_tokens')} prompt tokens cached")
+
+    def _parse_result(self, result: dict) -> str:
+        """Extract the assistant message from a chat completions response."""
+        # Providers with automatic prefix caching report how much of the prompt was served from cache
+        self._log_cache_usage(result.get("usage") or {})
+        return result["choices"][0]["message"]["content"]
+
+    def _parse_stream_line(self, line: str) -> str:
+        """Extract the content delta from one server-sent event line."""
+        if not line.startswith("data:"):
+            return ""
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return ""
+        chunk = _loads(data)
+        if "error" in chunk:
+            # Errors after the 200 status arrive as an event: {"error": {"message": ..., ...}}
+            error = chunk["error"]
+            raise RuntimeError(error.get("message", error) if isinstance(error, dict) else error)
+        if chunk.get("usage"):
+            self._log_cache_usage(chunk["usage"])
+        choices = chunk.get("choices") or []
+        if not choices:
+            return ""
+        return (choices[0].get("delta") or {}).get("content") or ""
 
 
 def create_llm_client() -> LLMClient:
     """Factory function to create an LLM client based on configuration."""
-    try:
-        from .config import Config
-    except ImportError:
-        # Handle direct import (for testing)
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(__file__))
-        from config import Config
-    config = Config()
+    config = Config.get()
     
     provider = config.LLM_PROVIDER.lower()
     model = config.LLM_MODEL
@@ -146,13 +484,21 @@ def create_llm_client() -> LLMClient:
         if not base_url:
             base_url = "http://localhost:11434"
         logger.info(f"Using OllamaClient with model {model} at {base_url}")
-        return OllamaClient(model, base_url)
+        client = OllamaClient(model, base_url, max_parallel=config.LLM_MAX_PARALLEL)
     elif provider in ["openai", "azure"]:
         if not base_url:
             base_url = "https://api.openai.com/v1" if provider == "openai" else ""
             if not base_url:
                 raise ValueError(f"LLM_BASE_URL required for {provider}")
         logger.info(f"Using OpenAIClient with model {model} at {base_url}")
-        return OpenAIClient(model, base_url, api_key)
+        client = OpenAIClient(model, base_url, api_key, http2=config.LLM_HTTP2, max_parallel=config.LLM_MAX_PARALLEL)
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    if config.CACHE_LLM_RESULTS:
+        if config.get_llm_temperature() == 0:
+            logger.info(f"Caching LLM responses in {config.LLM_CACHE_DIR}")
+            client = CachedLLMClient(client, model, config.LLM_CACHE_DIR, ttl_seconds=config.LLM_CACHE_TTL)
+        else:
+            logger.info("CACHE_LLM_RESULTS ignored: responses are only cached at LLM_TEMPERATURE=0")
+    return client
@@ -0,0 +1,31 @@
+"""Bounded least-recently-used caches shared by the task loader and repo reader."""
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Files are read from thread pools, so cache lookups, updates and clears are serialized
+_LOCK = threading.Lock()
+
+
+def lru_get(cache: OrderedDict, key: Hashable) -> Any:
+    """Return the entry cached under key, marking it most recently used, or None."""
+    with _LOCK:
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+        return entry
+
+
+def lru_put(cache: OrderedDict, key: Hashable, entry: Any, maxsize: int):
+    """Cache entry under key, evicting least recently used entries beyond maxsize."""
+    with _LOCK:
+        cache[key] = entry
+        cache.move_to_end(key)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+
+
+def lru_clear(cache: OrderedDict):
+    """Remove every entry from cache."""
+    with _LOCK:
+        cache.clear()
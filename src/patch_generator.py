@@ -1,12 +1,20 @@
 """Patch generator for creating unified diff patches."""
+import io
 import os
-import subprocess
+import re
 import logging
-import tempfile
-from typing import Optional, List, Dict
+from difflib import unified_diff
+from typing import Optional, Dict
 
 logger = logging.getLogger(__name__)
 
+# Markers delimiting the commit message and patch in an LLM response
+COMMIT_MSG_MARKER = "---COMMIT_MSG---"
+PATCH_MARKER = "---PATCH---"
+
+# File blocks in an LLM response: ---FILE:path/to/file--- ... content ... ---END---
+_FILE_BLOCK_RE = re.compile(r'---FILE:(.+?)---\s*(.*?)---END---', re.DOTALL)
+
 
 class PatchGenerator:
     """Generates patches from LLM-generated file changes."""
@@ -19,70 +27,59 @@ class PatchGenerator:
         full_path = os.path.join(self.repo_root, file_path.lstrip("/"))
         rel_path = file_path.lstrip("/")
 
-        # Create temporary file with new content
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.patch') as tmp:
-            tmp.write(new_content)
-            tmp_path = tmp.name
+        # Stat once; the result decides both whether to read and which diff header to emit
+        file_exists = os.path.exists(full_path)
 
-        try:
-            # Use git diff if available, otherwise create simple diff
-            if old_content is None:
-                # New file
-                if os.path.exists(full_path):
-                    old_content = self._read_if_exists(full_path)
-                else:
-                    old_content = ""
-
-            patch_lines = self._create_diff(rel_path, old_content, new_content, os.path.exists(full_path))
-            return "\n".join(patch_lines)
-        finally:
-            os.unlink(tmp_path)
+        # The diff is computed in memory, so no temporary copy of new_content is needed
+        if old_content is None:
+            # New file
+            old_content = self._read_if_exists(full_path) if file_exists else ""
+
+        return self._create_diff(rel_path, old_content, new_content, file_exists)
 
     def _read_if_exists(self, path: str) -> str:
         """Read file if it exists."""
-        if os.path.exists(path):
-            with open(path, "r") as f:
+        try:
+            # Text mode keeps universal newlines so CRLF files diff line by line as before
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
                 return f.read()
-        return ""
+        except FileNotFoundError:
+            return ""
 
-    def _create_diff(self, file_path: str, old_content: str, new_content: str, file_exists: bool) -> List[str]:
+    def _create_diff(self, file_path: str, old_content: str, new_content: str, file_exists: bool) -> str:
         """Create a unified diff between old and new content."""
-        from difflib import unified_diff
-
+        # difflib's matcher indexes both sequences, so the line lists are needed;
+        # the diff output itself is streamed into the buffer line by line
         old_lines = old_content.splitlines(keepends=True) if old_content else []
         new_lines = new_content.splitlines(keepends=True) if new_content else []
 
-        diff_lines = list(unified_diff(
+        # Add git diff header
+        mode = "100644"
+        buf = io.StringIO()
+        buf.write(f"diff --git a/{file_path} b/{file_path}\n")
+        buf.write(f"new file mode {mode}\n" if not file_exists else "index 0000000..1234567\n")
+        buf.write("--- /dev/null\n" if not file_exists else f"--- a/{file_path}\n")
+        buf.write(f"+++ b/{file_path}")
+
+        for line in unified_diff(
             old_lines,
             new_lines,
             fromfile=f"a/{file_path}" if file_exists else "/dev/null",
             tofile=f"b/{file_path}",
             lineterm=""
-        ))
+        ):
+            buf.write("\n")
+            buf.write(line)
 
-        # Add git diff header
-        mode = "100644"
-        header = [
-            f"diff --git a/{file_path} b/{file_path}",
-            f"new file mode {mode}" if not file_exists else f"index 0000000..1234567",
-            f"--- /dev/null" if not file_exists else f"--- a/{file_path}",
-            f"+++ b/{file_path}"
-        ]
-
-        return header + diff_lines
+        return buf.getvalue()
 
     def extract_files_from_response(self, llm_response: str) -> Dict[str, str]:
         """Extract file changes from LLM response."""
         files = {}
         
         # Simple extraction: look for file blocks in the response
-        # Format: ---FILE:path/to/file--- ... content ... ---END---
-        import re
-        
-        pattern = r'---FILE:(.+?)---\s*(.*?)---END---'
-        matches = re.findall(pattern, llm_response, re.DOTALL)
-        
-        for file_path, content in matches:
+        for match in _FILE_BLOCK_RE.finditer(llm_response):
+            file_path, content = match.groups()
             files[file_path.strip()] = content.strip()
         
         return files
@@ -90,20 +87,16 @@ class PatchGenerator:
 
 def parse_patch_response(response: str) -> tuple[str, str]:
     """Parse LLM response into commit message and patch."""
-    # Look for ---COMMIT_MSG--- and ---PATCH--- markers
-    commit_msg_start = response.find("---COMMIT_MSG---")
-    patch_start = response.find("---PATCH---")
-    
-    if commit_msg_start == -1 or patch_start == -1:
+    # Look for ---COMMIT_MSG--- and ---PATCH--- markers; the patch marker is only
+    # searched for after the commit marker so the response is scanned once
+    head, commit_sep, rest = response.partition(COMMIT_MSG_MARKER)
+    if not commit_sep:
         raise ValueError("Response must contain ---COMMIT_MSG--- and ---PATCH--- blocks")
     
-    if patch_start <= commit_msg_start:
-        raise ValueError("---PATCH--- must come after ---COMMIT_MSG---")
-    
-    # Extract commit message
-    commit_msg = response[commit_msg_start + len("---COMMIT_MSG---"):patch_start].strip()
-    
-    # Extract patch
-    patch = response[patch_start + len("---PATCH---"):].strip()
+    commit_msg, patch_sep, patch = rest.partition(PATCH_MARKER)
+    if not patch_sep:
+        if PATCH_MARKER in head:
+            raise ValueError("---PATCH--- must come after ---COMMIT_MSG---")
+        raise ValueError("Response must contain ---COMMIT_MSG--- and ---PATCH--- blocks")
     
-    return commit_msg, patch
+    return commit_msg.strip(), patch.strip()
@@ -1,10 +1,67 @@
 """Repository file reader."""
+import io
 import os
+import re
+import copy
+import codecs
+import fnmatch
 import logging
-from typing import List, Dict
+from collections import OrderedDict
+from typing import Callable, List, Dict, Optional, Tuple, Union
+
+try:
+    from .lru import lru_get, lru_put
+except ImportError:
+    # Handle direct import (when PYTHONPATH=./src and running as module)
+    from lru import lru_get, lru_put
 
 logger = logging.getLogger(__name__)
 
+# Repository structures keyed by (abs repo_root, max_depth) -> (st_mtime_ns of repo_root, structure);
+# one entry per root and depth, so a changed repository replaces its stale entry
+_STRUCTURE_CACHE: "OrderedDict[Tuple[str, int], Tuple[int, Dict[str, any]]]" = OrderedDict()
+
+# Rendered repository structure listings, same key as _STRUCTURE_CACHE -> (st_mtime_ns, listing)
+_RENDERED_STRUCTURE_CACHE: "OrderedDict[Tuple[str, int], Tuple[int, str]]" = OrderedDict()
+
+# Repositories kept per structure cache before the least recently used one is evicted
+_STRUCTURE_CACHE_MAXSIZE = 512
+
+# Directories never descended into by list_files (VCS metadata, dependencies, bytecode)
+_SKIP_DIRS = frozenset({".git", "node_modules", "__pycache__"})
+
+
+def _universal_newlines(text: str) -> str:
+    """Translate CRLF and CR line endings to LF, as text-mode open() does."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _name_matcher(patterns: Union[str, List[str], None]) -> Optional[Callable[[str], bool]]:
+    """
+    Compile file name patterns into a single matcher.
+    
+    Patterns containing *, ? or [ are globs matched against the whole name;
+    any other pattern matches as a substring. All patterns are combined into
+    one regular expression so each name is tested in a single search.
+    
+    Returns:
+        A predicate over file names, or None when there are no patterns
+    """
+    if patterns is None:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    if not patterns:
+        return None
+    alternatives = [
+        "^" + fnmatch.translate(pattern) if any(c in pattern for c in "*?[") else re.escape(pattern)
+        for pattern in dict.fromkeys(patterns)
+    ]
+    regex = re.compile("|".join(alternatives))
+    return lambda name: regex.search(name) is not None
+
 
 class RepoReader:
     """Reads files from the mounted repository."""
@@ -13,51 +70,193 @@ class RepoReader:
     def read_file(repo_root: str, file_path: str) -> str:
         """Read a single file from the repository."""
         full_path = os.path.join(repo_root, file_path.lstrip("/"))
-        if not os.path.exists(full_path):
-            raise FileNotFoundError(f"File not found in repo: {file_path}")
+        try:
+            with open(full_path, "rb") as f:
+                return _universal_newlines(f.read().decode("utf-8", errors="replace"))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found in repo: {file_path}") from None
+
+    @staticmethod
+    def read_file_preview(repo_root: str, file_path: str, max_chars: int = 500) -> str:
+        """
+        Read the beginning of a file without loading the whole file.
         
-        with open(full_path, "r") as f:
-            return f.read()
+        Args:
+            repo_root: Repository root path
+            file_path: Path relative to repo_root
+            max_chars: Maximum number of characters to return
+            
+        Returns:
+            The first max_chars characters, with "..." appended if the file is longer
+            
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        full_path = os.path.join(repo_root, file_path.lstrip("/"))
+
+        # UTF-8 uses at most 4 bytes per character, so this always covers max_chars + 1
+        try:
+            with open(full_path, "rb") as f:
+                data = f.read(max_chars * 4 + 1)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found in repo: {file_path}") from None
+
+        # Incremental decode drops a multi-byte sequence cut off at the end of the read
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        text = _universal_newlines(decoder.decode(data, final=False))
+        if len(text) > max_chars:
+            return text[:max_chars] + "..."
+        return text
 
     @staticmethod
-    def list_files(repo_root: str, directory: str = "", pattern: str = None) -> List[str]:
-        """List files in the repository, optionally matching a pattern."""
-        search_dir = os.path.join(repo_root, directory.lstrip("/"))
-        if not os.path.exists(search_dir):
-            return []
+    def list_files(
+        repo_root: str,
+        directory: str = "",
+        pattern: Union[str, List[str], None] = None
+    ) -> List[str]:
+        """
+        List files in the repository, optionally matching one or more patterns.
+        
+        Directories in _SKIP_DIRS (.git, node_modules, __pycache__) are not
+        descended into, and symlinked directories are not followed.
+        
+        Args:
+            repo_root: Repository root path
+            directory: Directory relative to repo_root to search (default: whole repo)
+            pattern: Optional pattern or list of patterns; a file is listed if its
+                name matches any of them (globs like "*.py", or substrings like ".txt")
+            
+        Returns:
+            Sorted list of file paths relative to repo_root
+        """
+        root_prefix = os.path.join(os.path.normpath(repo_root), "")
+        search_dir = os.path.normpath(os.path.join(repo_root, directory.lstrip("/")))
 
+        matches = _name_matcher(pattern)
         files = []
-        for root, _, filenames in os.walk(search_dir):
-            for filename in filenames:
-                rel_path = os.path.relpath(os.path.join(root, filename), repo_root)
-                if pattern is None or pattern in filename:
-                    files.append(rel_path)
+
+        def walk(path: str):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if entry.name not in _SKIP_DIRS and not entry.is_symlink():
+                            try:
+                                walk(entry.path)
+                            except OSError:
+                                continue
+                    elif matches is None or matches(entry.name):
+                        # Entries are built by joining onto search_dir, so the repo_root prefix is known
+                        if entry.path.startswith(root_prefix):
+                            files.append(entry.path[len(root_prefix):])
+                        else:
+                            files.append(os.path.relpath(entry.path, repo_root))
+
+        try:
+            walk(search_dir)
+        except OSError:
+            # Missing directory, or a file rather than a directory
+            return []
 
         return sorted(files)
 
+    @staticmethod
+    def _structure_cache_key(repo_root: str, max_depth: int) -> Tuple[Tuple[str, int], int]:
+        """Build the structure cache key and the repo root's current mtime."""
+        abs_root = os.path.abspath(repo_root)
+        try:
+            mtime_ns = os.stat(abs_root).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = -1
+        return (abs_root, max_depth), mtime_ns
+
     @staticmethod
     def get_repo_structure(repo_root: str, max_depth: int = 3) -> Dict[str, any]:
-        """Get a tree structure of the repository."""
-        structure = {}
+        """
+        Get a tree structure of the repository.
+        
+        The structure is cached per (repo_root, mtime of repo_root, max_depth), so
+        repeated calls on an unchanged repository skip the filesystem walk. Only
+        changes to the top-level entries of repo_root invalidate the cache.
+        """
+        key, mtime_ns = RepoReader._structure_cache_key(repo_root, max_depth)
+        cached = lru_get(_STRUCTURE_CACHE, key)
+        if cached and cached[0] == mtime_ns:
+            return copy.deepcopy(cached[1])
 
-        def build_tree(path: str, depth: int = 0):
-            if depth > max_depth:
-                return None
-            if os.path.isfile(path):
-                return os.path.getsize(path)
-            elif os.path.isdir(path):
-                tree = {}
-                try:
-                    entries = os.listdir(path)
+        structure = RepoReader._build_repo_structure(repo_root, max_depth)
+        lru_put(_STRUCTURE_CACHE, key, (mtime_ns, structure), _STRUCTURE_CACHE_MAXSIZE)
+        return copy.deepcopy(structure)
+
+    @staticmethod
+    def render_repo_structure(repo_root: str, max_depth: int = 3) -> str:
+        """
+        Render the repository structure as an indented listing for prompts.
+        
+        Lines are written directly while walking the tree, one per entry, indented
+        two spaces per level, with directories suffixed by "/". Entries follow the
+        same depth and dotfile rules as get_repo_structure and are cached with the
+        same (repo_root, mtime of repo_root, max_depth) key.
+        
+        Returns:
+            The rendered listing, or an empty string if the repository is empty
+        """
+        key, mtime_ns = RepoReader._structure_cache_key(repo_root, max_depth)
+        cached = lru_get(_RENDERED_STRUCTURE_CACHE, key)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        buf = io.StringIO()
+
+        def render(path: str, depth: int):
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(
+                        (entry for entry in it if not entry.name.startswith(".")),
+                        key=lambda entry: entry.name
+                    )
+            except PermissionError:
+                return
+            indent = "  " * depth
+            for entry in entries:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                buf.write(indent)
+                buf.write(entry.name)
+                buf.write("/\n" if is_dir else "\n")
+                if is_dir and depth + 1 <= max_depth:
+                    render(entry.path, depth + 1)
+
+        if max_depth >= 0 and os.path.isdir(repo_root):
+            render(repo_root, 0)
+        rendered = buf.getvalue()
+        lru_put(_RENDERED_STRUCTURE_CACHE, key, (mtime_ns, rendered), _STRUCTURE_CACHE_MAXSIZE)
+        return rendered
+
+    @staticmethod
+    def _build_repo_structure(repo_root: str, max_depth: int) -> Dict[str, any]:
+        """Walk the repository and build its tree structure."""
+
+        def build_tree(path: str, depth: int):
+            # scandir exposes the entry type from the directory listing itself, so only
+            # regular files need a stat call (for their size)
+            tree = {}
+            try:
+                with os.scandir(path) as entries:
                     for entry in entries:
-                        if entry.startswith(".") and entry != ".":
+                        if entry.name.startswith("."):
                             continue
-                        entry_path = os.path.join(path, entry)
-                        tree[entry] = build_tree(entry_path, depth + 1)
-                    return tree if tree else None
-                except PermissionError:
-                    return None
-            return None
-
-        structure = build_tree(repo_root) or {}
+                        if depth + 1 > max_depth:
+                            tree[entry.name] = None
+                        elif entry.is_dir(follow_symlinks=False):
+                            tree[entry.name] = build_tree(entry.path, depth + 1)
+                        elif entry.is_file():
+                            tree[entry.name] = entry.stat().st_size
+                        else:
+                            tree[entry.name] = None
+            except PermissionError:
+                return None
+            return tree if tree else None
+
+        if max_depth < 0 or not os.path.isdir(repo_root):
+            return {}
+        structure = build_tree(repo_root, 0) or {}
         return structure
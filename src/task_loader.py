@@ -1,210 +1,536 @@
 """Task loader for reading task definitions from context."""
 import os
+import re
+import copy
+import stat
+import itertools
 import yaml
 import logging
-from typing import Dict, List, Any
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, NamedTuple, Tuple, Union
 from pathlib import Path
 
+try:
+    from .lru import lru_get, lru_put, lru_clear
+except ImportError:
+    # Handle direct import (when PYTHONPATH=./src and running as module)
+    from lru import lru_get, lru_put, lru_clear
+
 logger = logging.getLogger(__name__)
 
+# libyaml's C parser when PyYAML was built with it, otherwise the pure Python safe loader
+try:
+    from yaml import CSafeLoader as _YAML_LOADER
+    _YAML_FALLBACK_WARNING_PENDING = False
+except ImportError:
+    from yaml import SafeLoader as _YAML_LOADER
+    # Warned about once, on the first parse (logging is configured by then)
+    _YAML_FALLBACK_WARNING_PENDING = True
 
-class TaskLoader:
-    """Loads and validates task definitions from context."""
-
-    @staticmethod
-    def load_task(repo_root: str, task_name: str, context_root: str = None) -> Dict[str, Any]:
-        """
-        Load a task definition, searching first in repo/tasks, then context/tasks.
-        
-        Args:
-            repo_root: Repository root path (required)
-            task_name: Name of the task (without .md extension)
-            context_root: Context root path (optional, only used if task not found in repo)
-            
-        Returns:
-            Task definition dictionary
-            
-        Raises:
-            FileNotFoundError: If task is not found in either location
-        """
-        # Try repo/tasks first
-        repo_tasks_dir = os.path.join(repo_root, "tasks")
-        repo_task_file = os.path.join(repo_tasks_dir, f"{task_name}.md")
-        
-        task_file = None
-        if os.path.exists(repo_task_file):
-            task_file = repo_task_file
-            logger.debug(f"Found task in repo: {repo_task_file}")
-        
-        # Fallback to context/tasks if not found in repo
-        if not task_file and context_root:
-            context_tasks_dir = os.path.join(context_root, "tasks")
-            context_task_file = os.path.join(context_tasks_dir, f"{task_name}.md")
-            if os.path.exists(context_task_file):
-                task_file = context_task_file
-                logger.debug(f"Found task in context: {context_task_file}")
-        
-        if not task_file:
-            locations = [repo_task_file]
-            if context_root:
-                locations.append(os.path.join(context_root, "tasks", f"{task_name}.md"))
-            raise FileNotFoundError(
-                f"Task '{task_name}' not found in repo/tasks or context/tasks. "
-                f"Searched: {', '.join(locations)}"
-            )
-
-        with open(task_file, "r") as f:
-            content = f.read()
-
-        # Parse YAML frontmatter
-        if not content.startswith("---"):
+# Parsed task definitions keyed by absolute path -> (st_mtime_ns, st_size, task)
+_TASK_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+
+# File contents keyed by (absolute path, binary) -> (st_mtime_ns, st_size, content)
+_FILE_CACHE: "OrderedDict[Tuple[str, bool], Tuple[int, int, Union[str, bytes]]]" = OrderedDict()
+
+# Entries kept per cache before the least recently used one is evicted
+_CACHE_MAXSIZE = 512
+
+
+class _PathKind(NamedTuple):
+    """How one kind of loaded file (context or repo) is keyed, logged and reported."""
+    key_prefix: str  # Prefix of the returned keys ("repo:" for repo files)
+    label: str  # "context" or "repo", used in log messages
+    description: str  # What the files are, used in the missing-files error
+    hint_description: str  # What to ensure exists, used in the missing-files hint
+
+
+_CONTEXT_FILES = _PathKind("", "context", "context files", "context files")
+_REPO_FILES = _PathKind("repo:", "repo", "repository files", "required files")
+
+
+@functools.lru_cache(maxsize=32)
+def _variable_pattern(keys: frozenset) -> re.Pattern:
+    """Compile a single pattern matching any {KEY} placeholder for the given keys."""
+    return re.compile("|".join(re.escape(f"{{{key}}}") for key in sorted(keys)))
+
+
+def substitute_variables(text: str, variables: Dict[str, str]) -> str:
+    """Replace {KEY} placeholders in text with variable values in a single pass."""
+    if not text or not variables:
+        return text
+    pattern = _variable_pattern(frozenset(variables))
+    return pattern.sub(lambda match: variables[match.group(0)[1:-1]], text)
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode UTF-8 bytes (invalid bytes become U+FFFD) with universal newlines, as text-mode open() does."""
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _cache_enabled() -> bool:
+    """Whether tasks and file contents are memoized; set TASK_LOADER_CACHE=0 to disable."""
+    return os.environ.get("TASK_LOADER_CACHE", "1").lower() not in ("0", "false")
+
+
+def _read_bytes(path: str, size_hint: int = None) -> bytes:
+    """
+    Read a whole file with raw os.open/os.read, skipping the io buffering layer.
+    
+    Args:
+        path: Path of the file to read
+        size_hint: Expected size in bytes (fstat'ed when not given)
+        
+    Returns:
+        File content as bytes
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if size_hint is None:
+            size_hint = os.fstat(fd).st_size
+        # One read covers the common case; keep reading on short reads or if the file grew
+        chunks = [os.read(fd, max(size_hint, 1))]
+        while chunks[-1]:
+            chunks.append(os.read(fd, 65536))
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _read_file_cached(path: str, st: os.stat_result = None, binary: bool = False) -> Union[str, bytes]:
+    """
+    Read a UTF-8 text file, reusing the cached content while (mtime, size) are unchanged.
+    
+    The file is read as bytes and decoded once; invalid bytes become U+FFFD
+    rather than failing the whole load, and CRLF or CR line endings become LF.
+    Binary reads skip the decode and are cached separately.
+    
+    Args:
+        path: Path of the file to read
+        st: Stat result of path when the caller already has one
+        binary: Return the raw bytes without decoding
+        
+    Returns:
+        File content
+    """
+    if not _cache_enabled():
+        data = _read_bytes(path, st.st_size if st else None)
+        return data if binary else _decode_text(data)
+
+    abs_path = os.path.abspath(path)
+    if st is None:
+        st = os.stat(abs_path)
+    cached = lru_get(_FILE_CACHE, (abs_path, binary))
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    content = _read_bytes(abs_path, st.st_size)
+    if not binary:
+        content = _decode_text(content)
+    lru_put(_FILE_CACHE, (abs_path, binary), (st.st_mtime_ns, st.st_size, content), _CACHE_MAXSIZE)
+    return content
+
+
+def _stat(path: str) -> os.stat_result:
+    """Return the stat result of path, or None if it cannot be stat'ed."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _scandir_files(root: str) -> Iterator[str]:
+    """
+    Yield the paths of all files under root, recursively, in sorted order.
+    
+    Entry types come from the directory listing itself, so no per-entry stat is
+    needed. A directory's files are yielded before its subdirectories are
+    descended (the same order as a sorted os.walk); symlinked directories are
+    not followed, and directories that cannot be listed are skipped, as os.walk
+    does.
+    
+    Args:
+        root: Directory to walk
+        
+    Returns:
+        Iterator of file paths (root joined with the path below it)
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError as e:
+        logger.debug("Skipping unreadable directory %s: %s", root, e)
+        return
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+        elif entry.is_file():
+            yield entry.path
+    for subdir in subdirs:
+        yield from _scandir_files(subdir)
+
+
+def _read_files(
+    paths: List[str],
+    max_workers: int,
+    stats: List[os.stat_result] = None,
+    binary: bool = False
+) -> List[Union[str, bytes]]:
+    """
+    Read several files concurrently, returning their contents in input order.
+    
+    Reads are I/O bound (especially on bind or network mounts), so threads
+    overlap them without GIL contention. A single file is read inline.
+    
+    Args:
+        paths: Paths of the files to read
+        max_workers: Maximum number of reader threads
+        stats: Optional stat results aligned with paths (None where unknown)
+        binary: Return raw bytes instead of decoded text
+        
+    Returns:
+        File contents, one per path
+    """
+    if stats is None:
+        stats = [None] * len(paths)
+    if len(paths) <= 1 or max_workers <= 1:
+        return [_read_file_cached(path, st, binary) for path, st in zip(paths, stats)]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+        return list(pool.map(_read_file_cached, paths, stats, itertools.repeat(binary)))
+
+
+def _find_task_file(repo_root: str, task_name: str, context_root: str = None) -> Tuple[str, os.stat_result]:
+    """
+    Locate a task file, searching first in repo/tasks, then context/tasks.
+    
+    A single stat both finds the task and provides its cache key.
+    
+    Args:
+        repo_root: Repository root path
+        task_name: Name of the task (without .md extension)
+        context_root: Context root path (optional)
+        
+    Returns:
+        Tuple of (task file path, stat result)
+        
+    Raises:
+        FileNotFoundError: If task is not found in either location
+    """
+    repo_task_file = os.path.join(repo_root, "tasks", f"{task_name}.md")
+    st = _stat(repo_task_file)
+    if st is not None:
+        logger.debug("Found task in repo: %s", repo_task_file)
+        return repo_task_file, st
+
+    # Fallback to context/tasks if not found in repo
+    locations = [repo_task_file]
+    if context_root:
+        context_task_file = os.path.join(context_root, "tasks", f"{task_name}.md")
+        st = _stat(context_task_file)
+        if st is not None:
+            logger.debug("Found task in context: %s", context_task_file)
+            return context_task_file, st
+        locations.append(context_task_file)
+
+    raise FileNotFoundError(
+        f"Task '{task_name}' not found in repo/tasks or context/tasks. "
+        f"Searched: {', '.join(locations)}"
+    )
+
+
+def _parse_task_file(path: str, task_name: str, metadata_only: bool = False) -> Dict[str, Any]:
+    """
+    Parse a task file's YAML frontmatter and (unless metadata_only) its content.
+    
+    The file is read line by line only until the closing --- of the frontmatter;
+    the content after it is read in one bulk read, or not at all when
+    metadata_only is set.
+    
+    Args:
+        path: Path of the task file
+        task_name: Task name used in error messages
+        metadata_only: Skip reading the content after the frontmatter
+        
+    Returns:
+        Task definition dictionary, with "content" unless metadata_only
+        
+    Raises:
+        ValueError: If the frontmatter is missing, unterminated, or invalid YAML
+    """
+    with open(path, "rb") as f:
+        first_line = f.readline()
+        if not first_line.startswith(b"---"):
             raise ValueError(f"Task {task_name} must start with YAML frontmatter (---)")
 
-        parts = content.split("---", 2)
-        if len(parts) < 3:
+        # Frontmatter runs from the opening --- to the next ---
+        frontmatter = []
+        body_start = None
+        for line in itertools.chain([first_line[3:]], f):
+            marker = line.find(b"---")
+            if marker != -1:
+                frontmatter.append(line[:marker])
+                body_start = line[marker + 3:]
+                break
+            frontmatter.append(line)
+        if body_start is None:
             raise ValueError(f"Task {task_name} must have YAML frontmatter and content")
 
-        try:
-            task_config = yaml.safe_load(parts[1])
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML in task {task_name}: {e}")
+        body = None if metadata_only else body_start + f.read()
+
+    global _YAML_FALLBACK_WARNING_PENDING
+    if _YAML_FALLBACK_WARNING_PENDING:
+        _YAML_FALLBACK_WARNING_PENDING = False
+        logger.warning("PyYAML was built without libyaml; install libyaml for faster task frontmatter parsing")
+
+    try:
+        task_config = yaml.load(_decode_text(b"".join(frontmatter)), Loader=_YAML_LOADER)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML in task {task_name}: {e}")
+
+    if body is not None:
+        task_config["content"] = _decode_text(body).strip()
+    return task_config
 
-        task_config["content"] = parts[2].strip()
+
+def clear_cache():
+    """Forget all memoized tasks and file contents."""
+    lru_clear(_TASK_CACHE)
+    lru_clear(_FILE_CACHE)
+
+
+def load_task(
+    repo_root: str,
+    task_name: str,
+    context_root: str = None,
+    metadata_only: bool = False
+) -> Dict[str, Any]:
+    """
+    Load a task definition, searching first in repo/tasks, then context/tasks.
+    
+    Args:
+        repo_root: Repository root path (required)
+        task_name: Name of the task (without .md extension)
+        context_root: Context root path (optional, only used if task not found in repo)
+        metadata_only: If True, only the frontmatter is read and the returned
+            dictionary has no "content" key
+        
+    Returns:
+        Task definition dictionary
+        
+    Raises:
+        FileNotFoundError: If task is not found in either location
+    """
+    # Searched on every call so a task added to repo/tasks always takes precedence
+    task_file, st = _find_task_file(repo_root, task_name, context_root)
+    use_cache = _cache_enabled()
+
+    # Reuse the parsed task while the file is unchanged
+    abs_task_file = os.path.abspath(task_file)
+    cached = lru_get(_TASK_CACHE, abs_task_file) if use_cache else None
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        logger.debug("Using cached task: %s", abs_task_file)
+        task_config = copy.deepcopy(cached[2])
+        if metadata_only:
+            task_config.pop("content", None)
         return task_config
 
-    @staticmethod
-    def load_context_files(context_root: str, context_paths: List[str], variables: Dict[str, str] = None) -> Dict[str, str]:
-        """
-        Load context files from the context root.
-        
-        Args:
-            context_root: Context root path (must exist)
-            context_paths: List of paths relative to context_root
-            variables: Optional dictionary of variables for path substitution
-            
-        Returns:
-            Dictionary of path -> file content
-            
-        Raises:
-            ValueError: If context_root doesn't exist, paths is None, or required files are missing
-        """
-        if not context_root or not os.path.exists(context_root):
-            raise ValueError(f"Context root does not exist: {context_root}")
-        
-        if context_paths is None:
-            raise ValueError(
-                "context_paths cannot be None. "
-                "If your task YAML has 'context:' with no value, either remove the key or set it to an empty list: 'context: []'"
-            )
-        
-        if not isinstance(context_paths, list):
-            raise TypeError(
-                f"context_paths must be a list, got {type(context_paths).__name__}. "
-                "Check your task YAML frontmatter format."
-            )
-        
-        variables = variables or {}
-        context_files = {}
-        missing_files = []
-        
-        for path_spec in context_paths:
-            # Substitute variables in path (e.g., {COLLECTION}, {VERSION})
-            resolved_path_spec = path_spec
-            for key, value in variables.items():
-                resolved_path_spec = resolved_path_spec.replace(f"{{{key}}}", value)
-            
-            # Resolve relative to context_root
-            resolved_path = os.path.join(context_root, resolved_path_spec.lstrip("/"))
-            
-            if os.path.isfile(resolved_path):
-                with open(resolved_path, "r") as f:
-                    context_files[resolved_path_spec] = f.read()
-                logger.debug(f"Loaded context file: {resolved_path}")
-            elif os.path.isdir(resolved_path):
-                # Load all files in directory
-                for root, _, files in os.walk(resolved_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(file_path, context_root)
-                        with open(file_path, "r") as f:
-                            context_files[rel_path] = f.read()
-                        logger.debug(f"Loaded context file: {file_path}")
-            else:
-                logger.error(f"Context path not found: {resolved_path} (from path spec: {path_spec})")
-                missing_files.append(f"{resolved_path} (from: {path_spec})")
-        
-        if missing_files:
-            raise FileNotFoundError(
-                f"Required context files not found:\n  " + "\n  ".join(missing_files) +
-                "\n\nEnsure all context files exist before running the task."
-            )
-
-        return context_files
-
-    @staticmethod
-    def load_repo_files(repo_root: str, repo_paths: List[str], variables: Dict[str, str] = None) -> Dict[str, str]:
-        """
-        Load repository files from the repo root.
-        
-        Args:
-            repo_root: Repository root path
-            repo_paths: List of paths relative to repo_root
-            variables: Optional dictionary of variables for path substitution
-            
-        Returns:
-            Dictionary of path -> file content
-            
-        Raises:
-            ValueError: If repo_paths is None or not a list
-            FileNotFoundError: If required files are missing
-        """
-        if repo_paths is None:
-            raise ValueError(
-                "repo_paths cannot be None. "
-                "If your task YAML has 'repo:' with no value, either remove the key or set it to an empty list: 'repo: []'"
-            )
-        
-        if not isinstance(repo_paths, list):
-            raise TypeError(
-                f"repo_paths must be a list, got {type(repo_paths).__name__}. "
-                "Check your task YAML frontmatter format."
-            )
-        
-        variables = variables or {}
-        repo_files = {}
-        missing_files = []
-        
-        for path_spec in repo_paths:
-            # Substitute variables in path (e.g., {COLLECTION}, {VERSION})
-            resolved_path_spec = path_spec
-            for key, value in variables.items():
-                resolved_path_spec = resolved_path_spec.replace(f"{{{key}}}", value)
-            
-            # Resolve relative to repo_root
-            resolved_path = os.path.join(repo_root, resolved_path_spec.lstrip("/"))
-            
-            if os.path.isfile(resolved_path):
-                with open(resolved_path, "r") as f:
-                    # Prefix with repo: to distinguish from context files
-                    repo_files[f"repo:{resolved_path_spec}"] = f.read()
-                logger.debug(f"Loaded repo file: {resolved_path}")
-            elif os.path.isdir(resolved_path):
-                # Load all files in directory
-                for root, _, files in os.walk(resolved_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(file_path, repo_root)
-                        with open(file_path, "r") as f:
-                            repo_files[f"repo:{rel_path}"] = f.read()
-                        logger.debug(f"Loaded repo file: {file_path}")
-            else:
-                logger.error(f"Repo path not found: {resolved_path} (from path spec: {path_spec})")
-                missing_files.append(f"{resolved_path} (from: {path_spec})")
-        
-        if missing_files:
-            raise FileNotFoundError(
-                f"Required repository files not found:\n  " + "\n  ".join(missing_files) +
-                "\n\nEnsure all required files exist before running the task."
-            )
-
-        return repo_files
+    task_config = _parse_task_file(abs_task_file, task_name, metadata_only)
+    if use_cache and not metadata_only:
+        lru_put(_TASK_CACHE, abs_task_file, (st.st_mtime_ns, st.st_size, task_config), _CACHE_MAXSIZE)
+    return copy.deepcopy(task_config)
+
+
+def load_context_files(
+    context_root: str,
+    context_paths: List[str],
+    variables: Dict[str, str] = None,
+    max_workers: int = 16,
+    binary: bool = False
+) -> Dict[str, Union[str, bytes]]:
+    """
+    Load context files from the context root.
+    
+    All file paths are resolved first, then read concurrently.
+    
+    Args:
+        context_root: Context root path (must exist)
+        context_paths: List of paths relative to context_root
+        variables: Optional dictionary of variables for path substitution
+        max_workers: Maximum number of threads reading files
+        binary: Return undecoded bytes instead of text
+        
+    Returns:
+        Dictionary of path -> file content
+        
+    Raises:
+        ValueError: If context_root doesn't exist, paths is None, or required files are missing
+    """
+    if not context_root or not os.path.exists(context_root):
+        raise ValueError(f"Context root does not exist: {context_root}")
+    
+    if context_paths is None:
+        raise ValueError(
+            "context_paths cannot be None. "
+            "If your task YAML has 'context:' with no value, either remove the key or set it to an empty list: 'context: []'"
+        )
+    
+    if not isinstance(context_paths, list):
+        raise TypeError(
+            f"context_paths must be a list, got {type(context_paths).__name__}. "
+            "Check your task YAML frontmatter format."
+        )
+    
+    return _load_paths(
+        context_root, context_paths, variables, _CONTEXT_FILES, max_workers=max_workers, binary=binary
+    )
+
+
+def load_repo_files(
+    repo_root: str,
+    repo_paths: List[str],
+    variables: Dict[str, str] = None,
+    max_workers: int = 16,
+    binary: bool = False
+) -> Dict[str, Union[str, bytes]]:
+    """
+    Load repository files from the repo root.
+    
+    All file paths are resolved first, then read concurrently.
+    
+    Args:
+        repo_root: Repository root path
+        repo_paths: List of paths relative to repo_root
+        variables: Optional dictionary of variables for path substitution
+        max_workers: Maximum number of threads reading files
+        binary: Return undecoded bytes instead of text
+        
+    Returns:
+        Dictionary of path -> file content
+        
+    Raises:
+        ValueError: If repo_paths is None or not a list
+        FileNotFoundError: If required files are missing
+    """
+    if repo_paths is None:
+        raise ValueError(
+            "repo_paths cannot be None. "
+            "If your task YAML has 'repo:' with no value, either remove the key or set it to an empty list: 'repo: []'"
+        )
+    
+    if not isinstance(repo_paths, list):
+        raise TypeError(
+            f"repo_paths must be a list, got {type(repo_paths).__name__}. "
+            "Check your task YAML frontmatter format."
+        )
+    
+    # Keys are prefixed with repo: to distinguish them from context files
+    return _load_paths(
+        repo_root, repo_paths, variables, _REPO_FILES, max_workers=max_workers, binary=binary
+    )
+
+
+def _load_paths(
+    root: str,
+    path_specs: List[str],
+    variables: Dict[str, str],
+    kind: _PathKind,
+    *,
+    max_workers: int,
+    binary: bool
+) -> Dict[str, Union[str, bytes]]:
+    """
+    Resolve validated path specs under root and read every file they name.
+    
+    Args:
+        root: Root the path specs are relative to
+        path_specs: List of file or directory paths relative to root
+        variables: Optional dictionary of variables for path substitution
+        kind: _CONTEXT_FILES or _REPO_FILES (key prefix, log label and error wording)
+        max_workers: Maximum number of threads reading files
+        binary: Return undecoded bytes instead of text
+        
+    Returns:
+        Dictionary of kind.key_prefix + path -> file content
+        
+    Raises:
+        FileNotFoundError: If any path spec does not exist
+    """
+    key_prefix, label, description, hint_description = kind
+    variables = variables or {}
+    pending = []  # (key, file path, stat result or None) in load order
+    missing_files = []
+    # Normalized paths already covered, so repeated or overlapping specs load each file once
+    seen_specs = set()
+    seen_files = set()
+    # Joined once; each path spec is then appended to the root with a plain concatenation
+    root_prefix = os.path.join(root, "")
+    
+    for path_spec in path_specs:
+        # Substitute variables in path (e.g., {COLLECTION}, {VERSION})
+        resolved_path_spec = substitute_variables(path_spec, variables)
+        resolved_path = root_prefix + resolved_path_spec.lstrip("/")
+        normalized_path = os.path.normpath(resolved_path)
+        if normalized_path in seen_specs:
+            logger.debug("Skipping duplicate %s path spec: %s", label, path_spec)
+            continue
+        seen_specs.add(normalized_path)
+        
+        # One stat classifies the path and is reused as the file cache key
+        st = _stat(resolved_path)
+        mode = st.st_mode if st else 0
+        if stat.S_ISREG(mode):
+            if normalized_path in seen_files:
+                logger.debug("Skipping %s file already loaded: %s", label, resolved_path)
+                continue
+            seen_files.add(normalized_path)
+            pending.append((f"{key_prefix}{resolved_path_spec}", resolved_path, st))
+        elif stat.S_ISDIR(mode):
+            # Load all files in directory, in sorted order so prompts are byte-identical across runs
+            for file_path in _scandir_files(resolved_path):
+                normalized_file = os.path.normpath(file_path)
+                if normalized_file in seen_files:
+                    logger.debug("Skipping %s file already loaded: %s", label, file_path)
+                    continue
+                seen_files.add(normalized_file)
+                pending.append((f"{key_prefix}{os.path.relpath(file_path, root)}", file_path, None))
+        else:
+            logger.error(f"{label.capitalize()} path not found: {resolved_path} (from path spec: {path_spec})")
+            missing_files.append(f"{resolved_path} (from: {path_spec})")
+    
+    if missing_files:
+        # One list joined once: heading, indented paths, blank line, hint
+        message_parts = [f"Required {description} not found:"]
+        message_parts.extend(f"  {missing}" for missing in missing_files)
+        message_parts.append("")
+        message_parts.append(f"Ensure all {hint_description} exist before running the task.")
+        raise FileNotFoundError("\n".join(message_parts))
+
+    contents = _read_files(
+        [file_path for _, file_path, _ in pending], max_workers, [st for _, _, st in pending], binary
+    )
+    loaded_files = {key: content for (key, _, _), content in zip(pending, contents)}
+
+    # Debug logging is lazy, and the per-file loop is skipped entirely above DEBUG
+    if logger.isEnabledFor(logging.DEBUG):
+        for _, file_path, _ in pending:
+            logger.debug("Loaded %s file: %s", label, file_path)
+
+    return loaded_files
+
+
+class TaskLoader:
+    """Loads and validates task definitions from context.
+
+    Kept as a namespace over the module-level functions for existing callers.
+    """
+
+    clear_cache = staticmethod(clear_cache)
+    load_task = staticmethod(load_task)
+    load_context_files = staticmethod(load_context_files)
+    load_repo_files = staticmethod(load_repo_files)
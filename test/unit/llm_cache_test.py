@@ -0,0 +1,112 @@
+"""Tests for the persistent LLM response cache."""
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from unittest.mock import patch, Mock
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+from llm_cache import CachedLLMClient
+
+
+class TestCachedLLMClient(unittest.TestCase):
+    """Tests for CachedLLMClient."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.backend = Mock()
+        self.backend.complete.return_value = "response"
+        self.client = CachedLLMClient(self.backend, "model", self.temp_dir)
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_second_identical_request_is_served_from_cache(self):
+        """Test that an identical request does not reach the wrapped client."""
+        first = self.client.complete("system", "user", temperature=0.0)
+        second = self.client.complete("system", "user", temperature=0.0)
+
+        self.assertEqual(first, "response")
+        self.assertEqual(second, "response")
+        self.backend.complete.assert_called_once()
+
+    def test_cache_persists_across_instances(self):
+        """Test that responses survive reopening the cache directory."""
+        self.client.complete("system", "user", temperature=0.0)
+
+        reopened = CachedLLMClient(Mock(), "model", self.temp_dir)
+        try:
+            self.assertEqual(reopened.complete("system", "user", temperature=0.0), "response")
+            reopened.client.complete.assert_not_called()
+        finally:
+            reopened.close()
+
+    def test_whitespace_only_differences_share_entry(self):
+        """Test that line endings and trailing whitespace do not change the key."""
+        self.client.complete("system\n", "line one  \r\n    indented\n", temperature=0.0)
+        self.client.complete("system", "\nline one\n    indented", temperature=0.0)
+        self.backend.complete.assert_called_once()
+
+        # Indentation is significant
+        self.client.complete("system", "line one\nindented", temperature=0.0)
+        self.assertEqual(self.backend.complete.call_count, 2)
+
+    def test_key_includes_model_and_temperature(self):
+        """Test that changing the model or temperature misses the cache."""
+        self.client.complete("system", "user", temperature=0.0)
+        self.client.complete("system", "user", temperature=0.5)
+        other_model = CachedLLMClient(self.backend, "other", self.temp_dir)
+        try:
+            other_model.complete("system", "user", temperature=0.0)
+        finally:
+            other_model.close()
+
+        self.assertEqual(self.backend.complete.call_count, 3)
+
+    def test_expired_entries_are_refreshed(self):
+        """Test that entries older than the TTL are requested again."""
+        self.client.ttl_seconds = 60
+        with patch("llm_cache.time.time", return_value=1000.0):
+            self.client.complete("system", "user", temperature=0.0)
+        with patch("llm_cache.time.time", return_value=1030.0):
+            self.client.complete("system", "user", temperature=0.0)
+        self.assertEqual(self.backend.complete.call_count, 1)
+
+        with patch("llm_cache.time.time", return_value=1100.0):
+            self.client.complete("system", "user", temperature=0.0)
+        self.assertEqual(self.backend.complete.call_count, 2)
+
+    def test_complete_many_only_sends_misses(self):
+        """Test that complete_many serves hits from the cache and keeps input order."""
+        self.backend.complete.return_value = "cached"
+        self.client.complete("s", "b", temperature=0.0)
+        self.backend.complete_many.return_value = ["fresh-a", "fresh-c"]
+
+        responses = self.client.complete_many([("s", "a"), ("s", "b"), ("s", "c")], temperature=0.0)
+
+        self.assertEqual(responses, ["fresh-a", "cached", "fresh-c"])
+        self.backend.complete_many.assert_called_once_with(
+            [("s", "a"), ("s", "c")], temperature=0.0, max_tokens=4096
+        )
+
+    def test_complete_stream_caches_joined_response(self):
+        """Test that a streamed response is cached and replayed as one chunk."""
+        self.backend.complete_stream.return_value = iter(["a", "b"])
+
+        self.assertEqual(list(self.client.complete_stream("system", "user", temperature=0.0)), ["a", "b"])
+        self.assertEqual(list(self.client.complete_stream("system", "user", temperature=0.0)), ["ab"])
+        self.backend.complete_stream.assert_called_once()
+
+    def test_close_closes_wrapped_client(self):
+        """Test that close also closes the wrapped client."""
+        backend = Mock()
+        client = CachedLLMClient(backend, "model", self.temp_dir)
+        client.close()
+        backend.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
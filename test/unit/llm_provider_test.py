@@ -1,12 +1,66 @@
 """Tests for LLM provider implementations."""
 import unittest
+import asyncio
+import json as json_module
 import os
 import sys
-from unittest.mock import patch, Mock
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+from unittest.mock import patch, Mock, MagicMock
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+import llm_provider
 from llm_provider import NullLLMClient, OllamaClient, OpenAIClient, create_llm_client
+from config import Config
 
 
+class _FakeAsyncClient:
+    """Minimal async HTTP client that echoes the Ollama prompt and tracks concurrency."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def post(self, path, json):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        response = Mock()
+        response.content = json_module.dumps({"response": json["prompt"]}).encode("utf-8")
+        return response
+
+
+class _StatusError(Exception):
+    """Stand-in for httpx.HTTPStatusError carrying a response status and headers."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = Mock(status_code=status_code, headers=headers or {})
+
+
+def _error_response(status_code, headers=None):
+    """Build a mock for httpx.Client.stream(...) whose response fails raise_for_status."""
+    response = Mock()
+    response.raise_for_status.side_effect = _StatusError(status_code, headers)
+    stream = MagicMock()
+    stream.__enter__.return_value = response
+    return stream
+
+
+def _stream_response(lines):
+    """Build a mock for httpx.Client.stream(...) whose response yields the given lines."""
+    response = Mock()
+    response.iter_lines.return_value = iter(lines)
+    stream = MagicMock()
+    stream.__enter__.return_value = response
+    return stream
+
 class TestNullLLMClient(unittest.TestCase):
     """Tests for NullLLMClient."""
 
@@ -19,24 +73,106 @@ class TestNullLLMClient(unittest.TestCase):
         self.assertIn("---COMMIT_MSG---", response)
         self.assertIn("---PATCH---", response)
 
+    def test_complete_many_returns_one_response_per_prompt(self):
+        """Test that complete_many returns a mock response per prompt."""
+        responses = self.client.complete_many([("s1", "u1"), ("s2", "u2")])
+        self.assertEqual(len(responses), 2)
+        self.assertIn("---PATCH---", responses[1])
+
 
 class TestOllamaClient(unittest.TestCase):
     """Tests for OllamaClient."""
 
     def setUp(self):
         self.client = OllamaClient("codellama", "http://localhost:11434")
+        self.client._client = Mock()
 
-    @patch('httpx.post')
-    def test_complete_calls_api(self, mock_post):
-        """Test that complete calls the Ollama API."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"response": "test response"}
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+    def test_complete_calls_api(self):
+        """Test that complete streams from the Ollama API and joins the chunks."""
+        self.client._client.stream.return_value = _stream_response([
+            '{"response": "test ", "done": false}',
+            '{"response": "response", "done": false}',
+            '{"response": "", "done": true}',
+        ])
 
         response = self.client.complete("system", "user")
         self.assertEqual(response, "test response")
-        mock_post.assert_called_once()
+        self.client._client.stream.assert_called_once()
+        self.assertEqual(self.client._client.stream.call_args.args, ("POST", "/api/generate"))
+        self.assertTrue(self.client._client.stream.call_args.kwargs["json"]["stream"])
+
+    def test_complete_stream_raises_on_error_line(self):
+        """Test that an error reported mid-stream is raised."""
+        self.client._client.stream.return_value = _stream_response(['{"error": "model not found"}'])
+
+        with self.assertRaises(RuntimeError):
+            list(self.client.complete_stream("system", "user"))
+
+    def test_complete_retries_rate_limited_request(self):
+        """Test that a 429 is retried after the Retry-After delay."""
+        self.client._client.stream.side_effect = [
+            _error_response(429, {"Retry-After": "2"}),
+            _stream_response(['{"response": "test response"}']),
+        ]
+
+        with patch("llm_provider.time.sleep") as sleep:
+            response = self.client.complete("system", "user")
+        self.assertEqual(response, "test response")
+        sleep.assert_called_once_with(2.0)
+        self.assertEqual(self.client._client.stream.call_count, 2)
+
+    def test_complete_does_not_retry_client_error(self):
+        """Test that a 4xx other than 429 fails without retrying."""
+        self.client._client.stream.return_value = _error_response(400)
+
+        with patch("llm_provider.time.sleep") as sleep:
+            with self.assertRaises(_StatusError):
+                self.client.complete("system", "user")
+        sleep.assert_not_called()
+        self.assertEqual(self.client._client.stream.call_count, 1)
+
+    def test_retry_delay_backoff_and_limit(self):
+        """Test that server errors back off exponentially and stop after MAX_RETRIES."""
+        error = _StatusError(503)
+        for attempt in range(self.client.MAX_RETRIES):
+            delay = self.client._retry_delay(attempt, error)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, self.client.RETRY_BASE_DELAY * 2 ** attempt)
+        self.assertIsNone(self.client._retry_delay(self.client.MAX_RETRIES, error))
+
+    def test_complete_reuses_http_client(self):
+        """Test that repeated calls share one pooled HTTP client."""
+        http_client = self.client._client
+        http_client.stream.side_effect = lambda *args, **kwargs: _stream_response(['{"response": "test response"}'])
+
+        self.client.complete("system", "user")
+        self.client.complete("system", "user")
+        self.assertIs(self.client.client, http_client)
+        self.assertEqual(http_client.stream.call_count, 2)
+
+    def test_close_releases_http_client(self):
+        """Test that close (and the context manager) closes the pooled client."""
+        http_client = self.client._client
+        with self.client:
+            pass
+        http_client.close.assert_called_once()
+        self.assertIsNone(self.client._client)
+
+    def test_complete_many_returns_responses_in_order(self):
+        """Test that complete_many gathers all prompts and bounds concurrency."""
+        fake_client = _FakeAsyncClient()
+        self.client.max_parallel = 2
+        prompts = [("sys", f"user {i}") for i in range(5)]
+
+        with patch.object(OllamaClient, "_create_async_client", return_value=fake_client):
+            responses = self.client.complete_many(prompts)
+
+        self.assertEqual(responses, [f"sys\n\nuser {i}" for i in range(5)])
+        self.assertEqual(fake_client.max_in_flight, 2)
+
+    def test_complete_many_empty(self):
+        """Test that complete_many with no prompts makes no requests."""
+        self.assertEqual(self.client.complete_many([]), [])
 
 
 class TestOpenAIClient(unittest.TestCase):
@@ -44,25 +180,97 @@ class TestOpenAIClient(unittest.TestCase):
 
     def setUp(self):
         self.client = OpenAIClient("gpt-4", "https://api.openai.com/v1", "test-key")
+        self.client._client = Mock()
 
-    @patch('httpx.post')
-    def test_complete_calls_api(self, mock_post):
-        """Test that complete calls the OpenAI API."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "choices": [{"message": {"content": "test response"}}]
-        }
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+    def test_complete_calls_api(self):
+        """Test that complete streams server-sent events from the OpenAI API."""
+        self.client._client.stream.return_value = _stream_response([
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            'data: {"choices": [{"delta": {"content": "test "}}]}',
+            '',
+            'data: {"choices": [{"delta": {"content": "response"}}]}',
+            'data: [DONE]',
+        ])
 
         response = self.client.complete("system", "user")
         self.assertEqual(response, "test response")
-        mock_post.assert_called_once()
+        self.client._client.stream.assert_called_once()
+        self.assertEqual(self.client._client.stream.call_args.args, ("POST", "/v1/chat/completions"))
+
+    def test_complete_stream_yields_chunks(self):
+        """Test that complete_stream yields each content delta as it arrives."""
+        self.client._client.stream.return_value = _stream_response([
+            'data: {"choices": [{"delta": {"content": "a"}}]}',
+            'data: {"choices": [{"delta": {"content": "b"}}]}',
+            'data: [DONE]',
+        ])
+
+        self.assertEqual(list(self.client.complete_stream("system", "user")), ["a", "b"])
+
+    def test_complete_stream_raises_on_error_event(self):
+        """Test that an error event sent mid-stream is raised instead of truncating the completion."""
+        self.client._client.stream.return_value = _stream_response([
+            'data: {"choices": [{"delta": {"content": "partial"}}]}',
+            'data: {"error": {"message": "The server had an error", "type": "server_error"}}',
+        ])
+
+        with self.assertRaises(RuntimeError) as cm:
+            self.client.complete("system", "user")
+        self.assertIn("The server had an error", str(cm.exception))
+
+    def test_complete_logs_cached_prompt_tokens(self):
+        """Test that prompt cache usage reported by the provider is logged."""
+        self.client._client.stream.return_value = _stream_response([
+            'data: {"choices": [{"delta": {"content": "test response"}}]}',
+            'data: {"choices": [], "usage": {"prompt_tokens": 2048, '
+            '"prompt_tokens_details": {"cached_tokens": 1024}}}',
+            'data: [DONE]',
+        ])
+
+        with self.assertLogs("llm_provider", level="INFO") as logs:
+            self.client.complete("system", "user")
+        self.assertIn("1024 of 2048 prompt tokens cached", logs.output[0])
+        payload = self.client._client.stream.call_args.kwargs["json"]
+        self.assertEqual(payload["stream_options"], {"include_usage": True})
+
+    def test_default_headers_include_authorization(self):
+        """Test that the pooled client is configured with the bearer token."""
+        headers = self.client._default_headers()
+        self.assertEqual(headers["Authorization"], "Bearer test-key")
+
+    def test_http2_falls_back_without_h2(self):
+        """Test that HTTP/2 is only negotiated when the h2 package is importable."""
+        with patch("importlib.util.find_spec", return_value=None):
+            self.assertFalse(self.client._http2_available())
+        with patch("importlib.util.find_spec", return_value=Mock()):
+            self.assertTrue(self.client._http2_available())
+
+    def test_http2_disabled(self):
+        """Test that HTTP/2 can be turned off."""
+        client = OpenAIClient("gpt-4", "https://api.openai.com/v1", "test-key", http2=False)
+        self.assertFalse(client._http2_available())
+
+
+class TestLoads(unittest.TestCase):
+    """Tests for the JSON decoding helper."""
+
+    def test_loads_with_and_without_orjson(self):
+        """Test that str and bytes decode the same with orjson or the stdlib fallback."""
+        for backend in (llm_provider.orjson, None):
+            with patch.object(llm_provider, "orjson", backend):
+                self.assertEqual(llm_provider._loads('{"response": "\\u00e9"}'), {"response": "é"})
+                self.assertEqual(llm_provider._loads(b'{"response": "ok"}'), {"response": "ok"})
 
 
 class TestCreateLLMClient(unittest.TestCase):
     """Tests for create_llm_client factory."""
 
+    def setUp(self):
+        # Drop the shared Config so each test's environment is read; restored afterwards
+        instance_patch = patch.object(Config, "_instance", None)
+        instance_patch.start()
+        self.addCleanup(instance_patch.stop)
+
     def tearDown(self):
         # Clean up environment variables
         for key in ["LLM_PROVIDER", "LLM_MODEL", "LLM_BASE_URL", "LLM_API_KEY"]:
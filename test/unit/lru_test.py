@@ -0,0 +1,44 @@
+"""Tests for the shared LRU cache helpers."""
+import unittest
+import os
+import sys
+from collections import OrderedDict
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+from lru import lru_get, lru_put, lru_clear
+
+
+class TestLRU(unittest.TestCase):
+    """Tests for lru_get, lru_put and lru_clear."""
+
+    def test_put_evicts_least_recently_used(self):
+        """Test that a read refreshes an entry and the oldest entry is evicted past maxsize."""
+        cache = OrderedDict()
+        lru_put(cache, "a", 1, maxsize=2)
+        lru_put(cache, "b", 2, maxsize=2)
+        self.assertEqual(lru_get(cache, "a"), 1)
+        lru_put(cache, "c", 3, maxsize=2)
+
+        self.assertEqual(list(cache), ["a", "c"])
+        self.assertIsNone(lru_get(cache, "b"))
+
+    def test_put_replaces_existing_entry(self):
+        """Test that storing an existing key replaces its entry without growing the cache."""
+        cache = OrderedDict()
+        lru_put(cache, "a", 1, maxsize=2)
+        lru_put(cache, "a", 2, maxsize=2)
+
+        self.assertEqual(cache, {"a": 2})
+
+    def test_clear(self):
+        """Test that lru_clear empties the cache."""
+        cache = OrderedDict()
+        lru_put(cache, "a", 1, maxsize=2)
+        lru_clear(cache)
+
+        self.assertEqual(cache, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
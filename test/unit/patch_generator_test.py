@@ -3,7 +3,9 @@ import unittest
 import tempfile
 import os
 import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 from patch_generator import parse_patch_response, PatchGenerator
 
 
@@ -44,6 +46,24 @@ some message
         with self.assertRaises(ValueError):
             parse_patch_response(response)
 
+    def test_parse_missing_patch_block(self):
+        """Test that a commit message without a patch block raises ValueError."""
+        with self.assertRaises(ValueError) as cm:
+            parse_patch_response("---COMMIT_MSG---\nfeat: no patch\n")
+        self.assertIn("must contain", str(cm.exception))
+
+    def test_parse_patch_marker_echoed_before_commit_msg(self):
+        """Test that a patch marker before the commit message is ignored when one follows it."""
+        response = """Using ---PATCH--- blocks as requested.
+---COMMIT_MSG---
+fix: correct typo
+---PATCH---
+diff --git a/a.txt b/a.txt
+"""
+        commit_msg, patch = parse_patch_response(response)
+        self.assertEqual(commit_msg, "fix: correct typo")
+        self.assertEqual(patch, "diff --git a/a.txt b/a.txt")
+
 
 class TestPatchGenerator(unittest.TestCase):
     """Tests for PatchGenerator class."""
@@ -76,6 +96,30 @@ class TestPatchGenerator(unittest.TestCase):
         self.assertIn("--- a/existing.txt", patch)
         self.assertIn("+++ b/existing.txt", patch)
 
+    def test_generate_patch_reads_existing_file(self):
+        """Test that the current file content is used when old_content is omitted."""
+        with open(os.path.join(self.temp_dir, "existing.txt"), "w") as f:
+            f.write("old line\n")
+
+        patch = self.generator.generate_patch("existing.txt", "new line\n")
+        self.assertIn("-old line", patch)
+        self.assertIn("+new line", patch)
+        self.assertEqual(os.listdir(self.temp_dir), ["existing.txt"])
+
+    def test_extract_files_from_response(self):
+        """Test extracting multiple file blocks from a response."""
+        response = """Here are the files:
+---FILE: src/a.py ---
+print("a")
+---END---
+---FILE:docs/b.md---
+
+# B
+---END---
+"""
+        files = self.generator.extract_files_from_response(response)
+        self.assertEqual(files, {"src/a.py": 'print("a")', "docs/b.md": "# B"})
+
 
 if __name__ == "__main__":
     unittest.main()
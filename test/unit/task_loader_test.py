@@ -4,7 +4,11 @@ import tempfile
 import os
 import sys
 import yaml
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+from unittest.mock import patch
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+import task_loader
 from task_loader import TaskLoader
 
 
@@ -42,11 +46,49 @@ Task instructions go here.
         self.assertIn("context", task)
         self.assertEqual(task["content"], "Task instructions go here.")
 
+    def test_task_loader_delegates_to_module_functions(self):
+        """Test that TaskLoader exposes the module-level loader functions."""
+        self.assertIs(TaskLoader.load_task, task_loader.load_task)
+        self.assertIs(TaskLoader.load_context_files, task_loader.load_context_files)
+        self.assertIs(TaskLoader.load_repo_files, task_loader.load_repo_files)
+        self.assertIs(TaskLoader.clear_cache, task_loader.clear_cache)
+
     def test_load_task_not_found(self):
         """Test loading a non-existent task raises FileNotFoundError."""
         with self.assertRaises(FileNotFoundError):
             TaskLoader.load_task(self.temp_dir, "nonexistent")
 
+    def test_load_task_falls_back_to_context(self):
+        """Test that a task missing from repo/tasks is loaded from context/tasks."""
+        context_root = os.path.join(self.temp_dir, "context")
+        os.makedirs(os.path.join(context_root, "tasks"))
+        with open(os.path.join(context_root, "tasks", "shared.md"), "w") as f:
+            f.write("---\ndescription: Shared task\n---\nBody.\n")
+
+        task = TaskLoader.load_task(self.temp_dir, "shared", context_root)
+        self.assertEqual(task["description"], "Shared task")
+
+    def test_load_task_repo_task_added_later_takes_precedence(self):
+        """Test that a task added to repo/tasks after a context load is used on the next load."""
+        TaskLoader.clear_cache()
+        context_root = os.path.join(self.temp_dir, "context")
+        os.makedirs(os.path.join(context_root, "tasks"))
+        with open(os.path.join(context_root, "tasks", "shared.md"), "w") as f:
+            f.write("---\ndescription: Context task\n---\nBody.\n")
+        TaskLoader.load_task(self.temp_dir, "shared", context_root)
+
+        # A task added to repo/tasks later wins without clearing the cache
+        repo_task_file = os.path.join(self.tasks_dir, "shared.md")
+        with open(repo_task_file, "w") as f:
+            f.write("---\ndescription: Repo task\n---\nBody.\n")
+        task = TaskLoader.load_task(self.temp_dir, "shared", context_root)
+        self.assertEqual(task["description"], "Repo task")
+
+        # Removing it falls back to the context task again
+        os.remove(repo_task_file)
+        task = TaskLoader.load_task(self.temp_dir, "shared", context_root)
+        self.assertEqual(task["description"], "Context task")
+
     def test_load_task_missing_frontmatter(self):
         """Test that task without frontmatter raises ValueError."""
         task_file = os.path.join(self.tasks_dir, "invalid.md")
@@ -56,6 +98,152 @@ Task instructions go here.
         with self.assertRaises(ValueError):
             TaskLoader.load_task(self.temp_dir, "invalid")
 
+    def test_load_task_unterminated_frontmatter(self):
+        """Test that frontmatter without a closing --- raises ValueError."""
+        with open(os.path.join(self.tasks_dir, "open.md"), "w") as f:
+            f.write("---\ndescription: Never closed\n")
+
+        with self.assertRaises(ValueError):
+            TaskLoader.load_task(self.temp_dir, "open")
+
+    def test_load_task_content_keeps_later_separators(self):
+        """Test that --- in the task body is kept as content."""
+        with open(os.path.join(self.tasks_dir, "rules.md"), "w") as f:
+            f.write("---\ndescription: Rules\n---\nBefore\n\n---\n\nAfter\n")
+
+        task = TaskLoader.load_task(self.temp_dir, "rules")
+        self.assertEqual(task["description"], "Rules")
+        self.assertEqual(task["content"], "Before\n\n---\n\nAfter")
+
+    def test_load_task_and_files_normalize_crlf(self):
+        """Test that CRLF line endings in tasks and loaded files become LF, as in text mode."""
+        with open(os.path.join(self.tasks_dir, "crlf.md"), "wb") as f:
+            f.write(b"---\r\ndescription: CRLF task\r\n---\r\nLine one.\r\nLine two.\r\n")
+        with open(os.path.join(self.temp_dir, "crlf.txt"), "wb") as f:
+            f.write(b"a\r\nb\rc\n")
+
+        task = TaskLoader.load_task(self.temp_dir, "crlf")
+        repo_files = TaskLoader.load_repo_files(self.temp_dir, ["crlf.txt"])
+
+        self.assertEqual(task["description"], "CRLF task")
+        self.assertEqual(task["content"], "Line one.\nLine two.")
+        self.assertEqual(repo_files["repo:crlf.txt"], "a\nb\nc\n")
+
+    def test_load_task_metadata_only(self):
+        """Test that metadata_only returns the frontmatter without content."""
+        with open(os.path.join(self.tasks_dir, "meta.md"), "w") as f:
+            f.write("---\ndescription: Meta\nrepo: [a.txt]\n---\nLong instructions.\n")
+
+        task = TaskLoader.load_task(self.temp_dir, "meta", metadata_only=True)
+        self.assertEqual(task, {"description": "Meta", "repo": ["a.txt"]})
+
+        # A full load afterwards still includes the content
+        task = TaskLoader.load_task(self.temp_dir, "meta")
+        self.assertEqual(task["content"], "Long instructions.")
+        self.assertNotIn("content", TaskLoader.load_task(self.temp_dir, "meta", metadata_only=True))
+
+    def test_clear_cache(self):
+        """Test that clear_cache forgets memoized tasks and files."""
+        with open(os.path.join(self.tasks_dir, "cached.md"), "w") as f:
+            f.write("---\ndescription: Cached\n---\nBody.\n")
+        with open(os.path.join(self.temp_dir, "file.txt"), "w") as f:
+            f.write("content")
+
+        TaskLoader.load_task(self.temp_dir, "cached")
+        TaskLoader.load_repo_files(self.temp_dir, ["file.txt"])
+        self.assertTrue(task_loader._TASK_CACHE)
+        self.assertTrue(task_loader._FILE_CACHE)
+
+        TaskLoader.clear_cache()
+        self.assertEqual(task_loader._TASK_CACHE, {})
+        self.assertEqual(task_loader._FILE_CACHE, {})
+
+    def test_file_cache_evicts_least_recently_used(self):
+        """Test that the file cache is bounded and evicts the least recently used file."""
+        TaskLoader.clear_cache()
+        for name in ["a.txt", "b.txt", "c.txt"]:
+            with open(os.path.join(self.temp_dir, name), "w") as f:
+                f.write(name)
+
+        with patch.object(task_loader, "_CACHE_MAXSIZE", 2):
+            TaskLoader.load_repo_files(self.temp_dir, ["a.txt"])
+            TaskLoader.load_repo_files(self.temp_dir, ["b.txt"])
+            TaskLoader.load_repo_files(self.temp_dir, ["a.txt"])
+            TaskLoader.load_repo_files(self.temp_dir, ["c.txt"])
+
+        cached = [os.path.basename(path) for path, _ in task_loader._FILE_CACHE]
+        self.assertEqual(cached, ["a.txt", "c.txt"])
+
+    def test_task_cache_evicts_least_recently_used(self):
+        """Test that the task cache is bounded like the file cache."""
+        TaskLoader.clear_cache()
+        for name in ["one", "two", "three"]:
+            with open(os.path.join(self.tasks_dir, f"{name}.md"), "w") as f:
+                f.write(f"---\ndescription: {name}\n---\nBody.\n")
+
+        with patch.object(task_loader, "_CACHE_MAXSIZE", 2):
+            for name in ["one", "two", "one", "three"]:
+                TaskLoader.load_task(self.temp_dir, name)
+
+        cached = [os.path.basename(path) for path in task_loader._TASK_CACHE]
+        self.assertEqual(cached, ["one.md", "three.md"])
+
+    def test_cache_disabled_by_environment(self):
+        """Test that TASK_LOADER_CACHE=0 bypasses memoization."""
+        TaskLoader.clear_cache()
+        with open(os.path.join(self.tasks_dir, "uncached.md"), "w") as f:
+            f.write("---\ndescription: Uncached\n---\nBody.\n")
+        with open(os.path.join(self.temp_dir, "file.txt"), "w") as f:
+            f.write("content")
+
+        with patch.dict(os.environ, {"TASK_LOADER_CACHE": "0"}):
+            task = TaskLoader.load_task(self.temp_dir, "uncached")
+            repo_files = TaskLoader.load_repo_files(self.temp_dir, ["file.txt"])
+        self.assertEqual(task["description"], "Uncached")
+        self.assertEqual(repo_files["repo:file.txt"], "content")
+        self.assertEqual(task_loader._TASK_CACHE, {})
+        self.assertEqual(task_loader._FILE_CACHE, {})
+
+    def test_load_task_warns_once_without_libyaml(self):
+        """Test that the pure Python YAML fallback is reported once."""
+        for name in ["one", "two"]:
+            with open(os.path.join(self.tasks_dir, f"{name}.md"), "w") as f:
+                f.write(f"---\ndescription: {name}\n---\nBody.\n")
+
+        with patch.object(task_loader, "_YAML_FALLBACK_WARNING_PENDING", True):
+            with self.assertLogs("task_loader", level="WARNING") as logs:
+                TaskLoader.load_task(self.temp_dir, "one")
+                TaskLoader.load_task(self.temp_dir, "two")
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("libyaml", logs.output[0])
+
+    def test_load_task_cache_invalidated_on_change(self):
+        """Test that a modified task file is re-parsed instead of served from cache."""
+        task_file = os.path.join(self.tasks_dir, "cached.md")
+        with open(task_file, "w") as f:
+            f.write("---\ndescription: First\n---\nBody.\n")
+
+        task = TaskLoader.load_task(self.temp_dir, "cached")
+        self.assertEqual(task["description"], "First")
+
+        with open(task_file, "w") as f:
+            f.write("---\ndescription: Second version\n---\nBody.\n")
+
+        task = TaskLoader.load_task(self.temp_dir, "cached")
+        self.assertEqual(task["description"], "Second version")
+
+    def test_load_task_cached_result_not_shared(self):
+        """Test that mutating a loaded task does not affect later loads."""
+        task_file = os.path.join(self.tasks_dir, "cached.md")
+        with open(task_file, "w") as f:
+            f.write("---\ndescription: Shared\nguarantees:\n  - One\n---\nBody.\n")
+
+        task = TaskLoader.load_task(self.temp_dir, "cached")
+        task["guarantees"].append("Two")
+
+        task = TaskLoader.load_task(self.temp_dir, "cached")
+        self.assertEqual(task["guarantees"], ["One"])
+
     def test_load_context_files(self):
         """Test loading context files."""
         # Create a test file
@@ -69,6 +257,57 @@ Task instructions go here.
         self.assertIn("specs/api_standards.md", context_files)
         self.assertIn("API Standards", context_files["specs/api_standards.md"])
 
+    def test_load_context_files_directory_sorted(self):
+        """Test that files loaded from a directory are in sorted path order."""
+        context_dir = os.path.join(self.temp_dir, "specs")
+        os.makedirs(os.path.join(context_dir, "b_dir"))
+        os.makedirs(os.path.join(context_dir, "a_dir"))
+        for rel_path in ["z.md", "b_dir/b.md", "a_dir/a.md", "m.md"]:
+            with open(os.path.join(context_dir, rel_path), "w") as f:
+                f.write(rel_path)
+
+        context_files = TaskLoader.load_context_files(self.temp_dir, ["specs"])
+        self.assertEqual(
+            list(context_files),
+            ["specs/m.md", "specs/z.md", "specs/a_dir/a.md", "specs/b_dir/b.md"]
+        )
+
+    def test_load_context_files_directory_skips_symlinked_dirs(self):
+        """Test that symlinked directories inside a context directory are not followed."""
+        context_dir = os.path.join(self.temp_dir, "specs")
+        outside_dir = os.path.join(self.temp_dir, "outside")
+        os.makedirs(context_dir)
+        os.makedirs(outside_dir)
+        with open(os.path.join(context_dir, "a.md"), "w") as f:
+            f.write("a")
+        with open(os.path.join(outside_dir, "secret.md"), "w") as f:
+            f.write("secret")
+        os.symlink(outside_dir, os.path.join(context_dir, "linked"))
+
+        context_files = TaskLoader.load_context_files(self.temp_dir, ["specs"])
+        self.assertEqual(list(context_files), ["specs/a.md"])
+
+    def test_load_context_files_directory_skips_unreadable_dirs(self):
+        """Test that a subdirectory that cannot be listed is skipped rather than failing the load."""
+        context_dir = os.path.join(self.temp_dir, "specs")
+        locked_dir = os.path.join(context_dir, "locked")
+        os.makedirs(locked_dir)
+        with open(os.path.join(context_dir, "a.md"), "w") as f:
+            f.write("a")
+        with open(os.path.join(locked_dir, "b.md"), "w") as f:
+            f.write("b")
+
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if path == locked_dir:
+                raise PermissionError(13, "Permission denied", path)
+            return real_scandir(path)
+
+        with patch("task_loader.os.scandir", side_effect=scandir):
+            context_files = TaskLoader.load_context_files(self.temp_dir, ["specs"])
+        self.assertEqual(context_files, {"specs/a.md": "a"})
+
     def test_load_context_files_with_variables(self):
         """Test loading context files with variable substitution."""
         # Create test files
@@ -126,12 +365,89 @@ Task instructions go here.
         self.assertIn("repo:/test_data/User0.1.0.json", repo_files)
         self.assertIn('"id": 1', repo_files["repo:/test_data/User0.1.0.json"])
 
+    def test_load_repo_files_substitutes_in_one_pass(self):
+        """Test that placeholders inside substituted values are not expanded again."""
+        with open(os.path.join(self.temp_dir, "{B}.txt"), "w") as f:
+            f.write("literal")
+
+        repo_files = TaskLoader.load_repo_files(self.temp_dir, ["{A}.txt"], {"A": "{B}", "B": "other"})
+        self.assertEqual(repo_files, {"repo:{B}.txt": "literal"})
+
+    def test_substitute_variables(self):
+        """Test that known placeholders are replaced and unknown ones and other braces are kept."""
+        text = task_loader.substitute_variables('{A} {"k": {}} {C}', {"A": "a", "B": "b"})
+        self.assertEqual(text, 'a {"k": {}} {C}')
+
+    def test_load_repo_files_stats_each_file_once(self):
+        """Test that a listed file is stat'ed once for both classification and caching."""
+        TaskLoader.clear_cache()
+        file_path = os.path.join(self.temp_dir, "file.txt")
+        with open(file_path, "w") as f:
+            f.write("content")
+
+        with patch.object(task_loader, "_stat", wraps=task_loader._stat) as mock_stat:
+            repo_files = TaskLoader.load_repo_files(self.temp_dir, ["file.txt"])
+        self.assertEqual(repo_files, {"repo:file.txt": "content"})
+        stat_paths = [call.args[0] for call in mock_stat.call_args_list]
+        self.assertEqual(stat_paths.count(file_path), 1)
+
+    def test_read_bytes_reads_past_size_hint(self):
+        """Test that a stale size hint does not truncate the file."""
+        path = os.path.join(self.temp_dir, "grown.txt")
+        with open(path, "wb") as f:
+            f.write(b"x" * 100000)
+
+        self.assertEqual(task_loader._read_bytes(path, size_hint=10), b"x" * 100000)
+        self.assertEqual(task_loader._read_bytes(path), b"x" * 100000)
+
+    def test_load_repo_files_binary(self):
+        """Test that binary=True returns undecoded bytes alongside cached text."""
+        with open(os.path.join(self.temp_dir, "data.txt"), "wb") as f:
+            f.write("caf\u00e9\n".encode("utf-8"))
+
+        text = TaskLoader.load_repo_files(self.temp_dir, ["data.txt"])
+        raw = TaskLoader.load_repo_files(self.temp_dir, ["data.txt"], binary=True)
+        self.assertEqual(text, {"repo:data.txt": "caf\u00e9\n"})
+        self.assertEqual(raw, {"repo:data.txt": "caf\u00e9\n".encode("utf-8")})
+
+    def test_load_repo_files_concurrent_keeps_order(self):
+        """Test that files read on several threads keep their load order and content."""
+        src_dir = os.path.join(self.temp_dir, "src")
+        os.makedirs(src_dir)
+        names = [f"file{i:02d}.py" for i in range(20)]
+        for name in names:
+            with open(os.path.join(src_dir, name), "w") as f:
+                f.write(f"# {name}")
+        os.makedirs(os.path.join(self.temp_dir, "lib"))
+        with open(os.path.join(self.temp_dir, "lib", "extra.py"), "w") as f:
+            f.write("# extra")
+
+        repo_files = TaskLoader.load_repo_files(self.temp_dir, ["src", "/lib/extra.py"], max_workers=4)
+        keys = list(repo_files)
+        self.assertEqual(keys[:20], [f"repo:src/{name}" for name in names])
+        self.assertEqual(keys[20], "repo:/lib/extra.py")
+        self.assertEqual(repo_files["repo:src/file07.py"], "# file07.py")
+
+    def test_load_repo_files_skips_duplicates(self):
+        """Test that repeated or overlapping path specs load each file once."""
+        src_dir = os.path.join(self.temp_dir, "src")
+        os.makedirs(os.path.join(src_dir, "sub"))
+        for name in ["a.py", "sub/b.py"]:
+            with open(os.path.join(src_dir, name), "w") as f:
+                f.write(name)
+
+        repo_files = TaskLoader.load_repo_files(
+            self.temp_dir, ["/src/a.py", "src", "src/./a.py", "src/sub", "/src/a.py"]
+        )
+        self.assertEqual(repo_files, {"repo:/src/a.py": "a.py", "repo:src/sub/b.py": "sub/b.py"})
+
     def test_load_repo_files_missing_raises_error(self):
         """Test that missing repo files raise FileNotFoundError."""
         with self.assertRaises(FileNotFoundError) as cm:
             TaskLoader.load_repo_files(self.temp_dir, ["nonexistent.py"])
         self.assertIn("Required repository files not found", str(cm.exception))
         self.assertIn("nonexistent.py", str(cm.exception))
+        self.assertIn("Ensure all required files exist before running the task.", str(cm.exception))
 
     def test_load_repo_files_none(self):
         """Test that None repo_paths raises ValueError with helpful message."""
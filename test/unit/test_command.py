@@ -1,10 +1,16 @@
 """Tests for CLI command."""
 import unittest
+import io
 import os
 import sys
 import tempfile
-from unittest.mock import patch, MagicMock
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+from command import main
 
 
 class TestCommand(unittest.TestCase):
@@ -12,22 +18,21 @@ class TestCommand(unittest.TestCase):
 
     def setUp(self):
         """Set up test environment."""
-        # Set up minimal environment
-        os.environ["LLM_PROVIDER"] = "null"
-        
-        # Create temporary directories
-        self.temp_dir = tempfile.mkdtemp()
+        # Create temporary directories, removed by a cleanup even if setUp fails later on
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
         self.repo_dir = os.path.join(self.temp_dir, "repo")
         self.context_dir = os.path.join(self.temp_dir, "context")
         self.tasks_dir = os.path.join(self.context_dir, "tasks")
         
-        os.makedirs(self.repo_dir)
-        os.makedirs(self.tasks_dir)
+        # context/ is created on the way to its tasks/ leaf
+        Path(self.tasks_dir).mkdir(parents=True)
+        Path(self.repo_dir).mkdir()
         
         # Create a simple task file
         task_file = os.path.join(self.tasks_dir, "test_task.md")
-        with open(task_file, "w") as f:
-            f.write("""---
+        Path(task_file).write_text("""---
 description: Test task
 context: []
 outputs: []
@@ -36,78 +41,50 @@ guarantees: []
 Test task content.
 """)
         
-        os.environ["REPO_ROOT"] = self.repo_dir
-        os.environ["CONTEXT_ROOT"] = self.context_dir
-        os.environ["TASK_NAME"] = "test_task"
-
-    def tearDown(self):
-        """Clean up after tests."""
-        import shutil
-        shutil.rmtree(self.temp_dir)
-        for key in ["REPO_ROOT", "CONTEXT_ROOT", "TASK_NAME", "LLM_PROVIDER"]:
-            if key in os.environ:
-                del os.environ[key]
+        # Minimal environment; restored after each test along with any test overrides
+        env_patch = patch.dict(os.environ, {
+            "LLM_PROVIDER": "null",
+            "REPO_ROOT": self.repo_dir,
+            "CONTEXT_ROOT": self.context_dir,
+            "TASK_NAME": "test_task",
+        })
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
 
-    @patch('sys.stdout')
     @patch('sys.exit')
-    def test_main_success(self, mock_exit, mock_stdout):
+    def test_main_success(self, mock_exit):
         """Test successful task execution."""
-        from command import main
-        
-        # Mock print to capture output
-        output_lines = []
-        original_print = print
-        
-        def mock_print(*args, **kwargs):
-            output_lines.append(' '.join(str(arg) for arg in args))
-        
-        with patch('builtins.print', side_effect=mock_print):
+        # Capture what main() prints without replacing print itself
+        with redirect_stdout(io.StringIO()) as stdout:
             main()
         
         # Check that output format is correct
-        output = '\n'.join(output_lines)
+        output = stdout.getvalue()
         self.assertIn("---COMMIT_MSG---", output)
         self.assertIn("---PATCH---", output)
         
         # Check exit was called with 0
         mock_exit.assert_called_once_with(0)
 
-    @patch('sys.exit')
-    def test_main_task_not_found(self, mock_exit):
-        """Test handling of non-existent task."""
-        os.environ["TASK_NAME"] = "nonexistent"
-        from command import main
-        
-        with patch('sys.stderr'):
-            main()
+    def test_main_error_paths_exit_1(self):
+        """Test that a missing task, missing task name, or invalid root exits with code 1."""
+        repo_file = os.path.join(self.temp_dir, "not_a_dir.txt")
+        Path(repo_file).write_text("content")
+        cases = {
+            "task not found": {"TASK_NAME": "nonexistent"},
+            "task name missing": {"TASK_NAME": ""},
+            "repo root not found": {"REPO_ROOT": "/nonexistent"},
+            "repo root not a directory": {"REPO_ROOT": repo_file},
+            "repo root under a file": {"REPO_ROOT": os.path.join(repo_file, "x")},
+            "context root not found": {"CONTEXT_ROOT": "/nonexistent"},
+        }
         
-        # Should exit with error code 1
-        mock_exit.assert_called_once_with(1)
-
-    @patch('sys.exit')
-    def test_main_repo_root_not_found(self, mock_exit):
-        """Test handling of non-existent repo root."""
-        os.environ["REPO_ROOT"] = "/nonexistent"
-        from command import main
-        
-        with patch('sys.stderr'):
-            main()
-        
-        # Should exit with error code 1
-        mock_exit.assert_called_once_with(1)
-
-    @patch('sys.exit')
-    def test_main_context_root_not_found(self, mock_exit):
-        """Test handling of non-existent context root."""
-        os.environ["CONTEXT_ROOT"] = "/nonexistent"
-        from command import main
-        
-        with patch('sys.stderr'):
-            main()
-        
-        # Should exit with error code 1
-        mock_exit.assert_called_once_with(1)
-
+        for name, env in cases.items():
+            with self.subTest(name), patch.dict(os.environ, env), patch('sys.stderr'):
+                # sys.exit is not mocked, so main() stops at the first exit as it does in production
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 1)
 
 
 if __name__ == "__main__":
@@ -3,40 +3,49 @@ import unittest
 import os
 import sys
 import logging
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+from unittest.mock import patch
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 from config import Config
 
+# Environment variables that would override the defaults under test
+_CONFIG_ENV_VARS = [
+    "REPO_ROOT", "CONTEXT_ROOT", "LOG_LEVEL",
+    "LLM_PROVIDER", "LLM_MODEL", "LLM_BASE_URL", "LLM_API_KEY",
+    "LLM_TEMPERATURE", "LLM_MAX_TOKENS", "CACHE_LLM_RESULTS",
+    "LLM_CACHE_DIR", "LLM_MAX_PARALLEL", "LLM_CACHE_TTL", "IO_PARALLEL", "LLM_HTTP2"
+]
+
 
 class TestConfig(unittest.TestCase):
     """Tests for Config class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build one default Config for the tests that only read it."""
+        with patch.dict(os.environ):
+            for key in _CONFIG_ENV_VARS:
+                os.environ.pop(key, None)
+            cls.default_config = Config()
+
     def setUp(self):
         """Set up test environment."""
-        # Clear environment variables
-        env_vars_to_clear = [
-            "REPO_ROOT", "CONTEXT_ROOT", "LOG_LEVEL",
-            "LLM_PROVIDER", "LLM_MODEL", "LLM_BASE_URL", "LLM_API_KEY",
-            "LLM_TEMPERATURE", "LLM_MAX_TOKENS"
-        ]
-        for key in env_vars_to_clear:
-            if key in os.environ:
-                del os.environ[key]
-
-    def tearDown(self):
-        """Clean up after tests."""
-        # Clear environment variables
-        env_vars_to_clear = [
-            "REPO_ROOT", "CONTEXT_ROOT", "LOG_LEVEL",
-            "LLM_PROVIDER", "LLM_MODEL", "LLM_BASE_URL", "LLM_API_KEY",
-            "LLM_TEMPERATURE", "LLM_MAX_TOKENS"
-        ]
-        for key in env_vars_to_clear:
-            if key in os.environ:
-                del os.environ[key]
+        # The whole environment is restored after each test, including anything a test sets
+        env_patch = patch.dict(os.environ)
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+        for key in _CONFIG_ENV_VARS:
+            os.environ.pop(key, None)
+
+    def _config_with(self, **env):
+        """Build a Config with the given environment overrides (restored after the test)."""
+        os.environ.update(env)
+        return Config()
 
     def test_default_values(self):
         """Test that default values are set correctly."""
-        config = Config()
+        config = self.default_config
         self.assertEqual(config.REPO_ROOT, "/workspace/repo")
         self.assertEqual(config.CONTEXT_ROOT, "/workspace/context")
         self.assertEqual(config.LOG_LEVEL, logging.INFO)
@@ -45,16 +54,18 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(config.LLM_BASE_URL, "http://localhost:11434")
         self.assertEqual(config.LLM_TEMPERATURE, 7)
         self.assertEqual(config.LLM_MAX_TOKENS, 8192)
+        self.assertEqual(config.IO_PARALLEL, 16)
+        self.assertTrue(config.LLM_HTTP2)
 
     def test_environment_variable_override(self):
         """Test that environment variables override defaults."""
-        os.environ["REPO_ROOT"] = "/custom/repo"
-        os.environ["LLM_PROVIDER"] = "ollama"
-        os.environ["LLM_MODEL"] = "llama3"
-        os.environ["LLM_TEMPERATURE"] = "8"
-        os.environ["LLM_MAX_TOKENS"] = "4096"
-        
-        config = Config()
+        config = self._config_with(
+            REPO_ROOT="/custom/repo",
+            LLM_PROVIDER="ollama",
+            LLM_MODEL="llama3",
+            LLM_TEMPERATURE="8",
+            LLM_MAX_TOKENS="4096",
+        )
         
         self.assertEqual(config.REPO_ROOT, "/custom/repo")
         self.assertEqual(config.LLM_PROVIDER, "ollama")
@@ -62,9 +73,25 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(config.LLM_TEMPERATURE, 8)
         self.assertEqual(config.LLM_MAX_TOKENS, 4096)
 
+    def test_empty_environment_value_uses_default(self):
+        """Test that an empty environment variable falls back to the default."""
+        config = self._config_with(LLM_MAX_TOKENS="")
+        
+        self.assertEqual(config.LLM_MAX_TOKENS, 8192)
+        item = next(item for item in config.config_items if item["name"] == "LLM_MAX_TOKENS")
+        self.assertEqual(item["from"], "default")
+
+    def test_boolean_values(self):
+        """Test that boolean configuration values are parsed from strings."""
+        self.assertFalse(self.default_config.CACHE_LLM_RESULTS)
+        
+        config = self._config_with(CACHE_LLM_RESULTS="True")
+        self.assertTrue(config.CACHE_LLM_RESULTS)
+        self.assertFalse(config.get_default("CACHE_LLM_RESULTS"))
+
     def test_config_items_tracking(self):
         """Test that config_items tracks all configuration values."""
-        config = Config()
+        config = self.default_config
         self.assertGreater(len(config.config_items), 0)
         
         # Check that all config values are tracked
@@ -75,8 +102,7 @@ class TestConfig(unittest.TestCase):
 
     def test_secret_masking(self):
         """Test that secrets are masked in config_items."""
-        os.environ["LLM_API_KEY"] = "secret-key-123"
-        config = Config()
+        config = self._config_with(LLM_API_KEY="secret-key-123")
         
         api_key_item = next(item for item in config.config_items if item["name"] == "LLM_API_KEY")
         self.assertEqual(api_key_item["value"], "secret")
@@ -84,8 +110,7 @@ class TestConfig(unittest.TestCase):
 
     def test_get_llm_temperature_as_float(self):
         """Test that get_llm_temperature returns float value."""
-        os.environ["LLM_TEMPERATURE"] = "7"
-        config = Config()
+        config = self._config_with(LLM_TEMPERATURE="7")
         
         temp = config.get_llm_temperature()
         self.assertIsInstance(temp, float)
@@ -93,13 +118,27 @@ class TestConfig(unittest.TestCase):
 
     def test_get_default(self):
         """Test get_default method."""
-        config = Config()
+        config = self.default_config
         self.assertEqual(config.get_default("REPO_ROOT"), "/workspace/repo")
         # get_default returns int for config_ints values (converted from string)
         self.assertEqual(config.get_default("LLM_TEMPERATURE"), 7)
         self.assertEqual(config.get_default("LLM_MAX_TOKENS"), 8192)
         self.assertIsNone(config.get_default("NONEXISTENT"))
 
+    def test_get_returns_shared_instance(self):
+        """Test that Config.get returns the most recently constructed instance."""
+        config = Config()
+        self.assertIs(Config.get(), config)
+        self.assertIs(Config.get(), Config.get())
+
+    def test_get_constructs_when_unset(self):
+        """Test that Config.get constructs an instance when none exists."""
+        self.addCleanup(setattr, Config, "_instance", Config._instance)
+        Config._instance = None
+        config = Config.get()
+        self.assertIsInstance(config, Config)
+        self.assertIs(Config.get(), config)
+
     def test_logging_configuration(self):
         """Test that logging is configured."""
         config = Config()
@@ -107,10 +146,27 @@ class TestConfig(unittest.TestCase):
         # Check that root logger level is set
         self.assertEqual(logging.root.level, config.LOG_LEVEL)
 
+    def test_logging_not_reconfigured_for_same_level(self):
+        """Test that handlers are not rebuilt when the level is unchanged."""
+        Config()
+        handlers = list(logging.root.handlers)
+        
+        Config()
+        
+        self.assertEqual(logging.root.handlers, handlers)
+
+    def test_logging_reconfigured_after_external_reset(self):
+        """Test that Config restores logging when the root logger was changed elsewhere."""
+        config = Config()
+        logging.root.setLevel(logging.CRITICAL)
+        
+        Config()
+        
+        self.assertEqual(logging.root.level, config.LOG_LEVEL)
+
     def test_log_level_from_env(self):
         """Test that LOG_LEVEL environment variable is respected."""
-        os.environ["LOG_LEVEL"] = "DEBUG"
-        config = Config()
+        config = self._config_with(LOG_LEVEL="DEBUG")
         
         self.assertEqual(config.LOG_LEVEL, logging.DEBUG)
         self.assertEqual(logging.root.level, logging.DEBUG)
@@ -3,40 +3,72 @@ import unittest
 import os
 import sys
 import tempfile
-import shutil
+from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 from executor import Executor
-from llm_provider import NullLLMClient
+from llm_provider import LLMClient, NullLLMClient
+from config import Config
+
+# One LLM client mock for the whole module, reset before every test; the spec
+# rejects attributes LLMClient does not define
+_MOCK_LLM = Mock(spec=LLMClient)
+_VALID_RESPONSE = NullLLMClient().complete("", "")
+
+_BASIC_TASK = """---
+description: Test task
+context: []
+outputs: []
+guarantees: []
+---
+Test content.
+"""
 
 
 class TestExecutor(unittest.TestCase):
     """Tests for Executor class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Write the read-only basic task once for the tests that only execute it."""
+        shared_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(shared_dir.cleanup)
+        cls.shared_context_dir = os.path.join(shared_dir.name, "context")
+        os.makedirs(os.path.join(cls.shared_context_dir, "tasks"))
+        Path(os.path.join(cls.shared_context_dir, "tasks", "test_task.md")).write_text(_BASIC_TASK)
+
     def setUp(self):
         """Set up test environment."""
-        # Create temporary directories
-        self.temp_dir = tempfile.mkdtemp()
+        _MOCK_LLM.reset_mock(return_value=True, side_effect=True)
+        _MOCK_LLM.complete.return_value = _VALID_RESPONSE
+        self.mock_client = _MOCK_LLM
+
+        # Create temporary directories, removed by a cleanup even if setUp fails later on
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
         self.repo_dir = os.path.join(self.temp_dir, "repo")
         self.context_dir = os.path.join(self.temp_dir, "context")
         self.tasks_dir = os.path.join(self.context_dir, "tasks")
         
-        os.makedirs(self.repo_dir)
-        os.makedirs(self.tasks_dir)
+        # context/ is created on the way to its tasks/ leaf
+        Path(self.tasks_dir).mkdir(parents=True)
+        Path(self.repo_dir).mkdir()
         
-        # Set environment for config
-        os.environ["LLM_PROVIDER"] = "null"
-
-    def tearDown(self):
-        """Clean up after tests."""
-        shutil.rmtree(self.temp_dir)
-        for key in ["LLM_PROVIDER"]:
-            if key in os.environ:
-                del os.environ[key]
+        # Set environment for config; restored after each test
+        env_patch = patch.dict(os.environ, {"LLM_PROVIDER": "null"})
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+        # Drop the shared Config so Config.get() reads that environment; restored afterwards
+        instance_patch = patch.object(Config, "_instance", None)
+        instance_patch.start()
+        self.addCleanup(instance_patch.stop)
 
     def test_executor_with_custom_llm_client(self):
         """Test executor with custom LLM client."""
-        mock_client = Mock()
+        mock_client = self.mock_client
         mock_client.complete.return_value = """---COMMIT_MSG---
 feat: test commit
 
@@ -48,20 +80,9 @@ new file mode 100644
 @@ -0,0 +1 @@
 +test
 """
-        # Create a simple task file
-        task_file = os.path.join(self.tasks_dir, "test_task.md")
-        with open(task_file, "w") as f:
-            f.write("""---
-description: Test task
-context: []
-outputs: []
-guarantees: []
----
-Test content.
-""")
         # Verify it can accept a custom LLM client
         commit_message, patch = Executor.execute_task(
-            self.repo_dir, "test_task", self.context_dir, llm_client=mock_client
+            self.repo_dir, "test_task", self.shared_context_dir, llm_client=mock_client
         )
         # Verify mock was called
         mock_client.complete.assert_called_once()
@@ -70,8 +91,7 @@ Test content.
         """Test successful task execution."""
         # Create a simple task file
         task_file = os.path.join(self.tasks_dir, "test_task.md")
-        with open(task_file, "w") as f:
-            f.write("""---
+        Path(task_file).write_text("""---
 description: Test task description
 context: []
 outputs: []
@@ -92,13 +112,11 @@ Test task content.
         """Test task execution with context files."""
         # Create context file
         context_file = os.path.join(self.context_dir, "standards.md")
-        with open(context_file, "w") as f:
-            f.write("# Standards\n\nTest standards content.")
+        Path(context_file).write_text("# Standards\n\nTest standards content.")
         
         # Create task with context
         task_file = os.path.join(self.tasks_dir, "test_task.md")
-        with open(task_file, "w") as f:
-            f.write("""---
+        Path(task_file).write_text("""---
 description: Test task with context
 context:
   - standards.md
@@ -113,12 +131,35 @@ Test task content.
         self.assertIsInstance(commit_message, str)
         self.assertIsInstance(patch, str)
 
+    def test_execute_task_with_context_and_repo_files(self):
+        """Test that context and repo files are both included in the system prompt."""
+        Path(os.path.join(self.context_dir, "standards.md")).write_text("Context standards content")
+        Path(os.path.join(self.repo_dir, "main.py")).write_text("print('repo content')")
+        
+        task_file = os.path.join(self.tasks_dir, "test_task.md")
+        Path(task_file).write_text("""---
+description: Test task with context and repo files
+context:
+  - standards.md
+repo:
+  - main.py
+---
+Test task content.
+""")
+        mock_client = self.mock_client
+        
+        Executor.execute_task(self.repo_dir, "test_task", self.context_dir, llm_client=mock_client)
+        
+        system_prompt = mock_client.complete.call_args.kwargs["system_prompt"]
+        self.assertIn("Context standards content", system_prompt)
+        self.assertIn("--- repo:main.py ---", system_prompt)
+        self.assertLess(system_prompt.index("standards.md"), system_prompt.index("repo:main.py"))
+
     def test_execute_task_with_variables(self):
         """Test task execution with variable substitution."""
         # Create task with variables
         task_file = os.path.join(self.tasks_dir, "test_task.md")
-        with open(task_file, "w") as f:
-            f.write("""---
+        Path(task_file).write_text("""---
 description: Test task with {SERVICE}
 context: []
 outputs: []
@@ -132,6 +173,22 @@ Task for {SERVICE} service.
         self.assertIsInstance(commit_message, str)
         self.assertIsInstance(patch, str)
 
+    def test_load_environment_variables_from_snapshot(self):
+        """Test that required variables are read from the supplied environment snapshot."""
+        task = {"description": "Env task", "environment": ["SERVICE"]}
+        
+        env_vars = Executor._load_environment_variables(task, {"SERVICE": "api", "OTHER": "x"})
+        
+        self.assertEqual(env_vars, {"SERVICE": "api"})
+
+    def test_load_environment_variables_missing(self):
+        """Test that missing required variables raise ValueError."""
+        task = {"description": "Env task", "environment": ["SERVICE", "VERSION"]}
+        
+        with self.assertRaises(ValueError) as cm:
+            Executor._load_environment_variables(task, {})
+        self.assertIn("SERVICE, VERSION", str(cm.exception))
+
     def test_build_system_prompt(self):
         """Test system prompt building."""
         task = {
@@ -164,8 +221,7 @@ Task for {SERVICE} service.
         """Test user prompt building."""
         # Create a file in repo
         repo_file = os.path.join(self.repo_dir, "test.txt")
-        with open(repo_file, "w") as f:
-            f.write("Test file content")
+        Path(repo_file).write_text("Test file content")
         
         task = {
             "content": "Create file for {SERVICE}",
@@ -179,12 +235,41 @@ Task for {SERVICE} service.
         self.assertIn("Test file content", prompt)
         self.assertIn("Repository structure", prompt)
 
+    def test_build_user_prompt_multiple_variables(self):
+        """Test that all variables are substituted and unknown placeholders are kept."""
+        task = {"content": "{SERVICE} uses {VERSION} of {SERVICE}; {UNKNOWN} stays"}
+        variables = {"SERVICE": "api", "VERSION": "1.2.3"}
+        
+        prompt = Executor._build_user_prompt(self.repo_dir, task, variables)
+        
+        self.assertIn("api uses 1.2.3 of api; {UNKNOWN} stays", prompt)
+
+    def test_build_user_prompt_preserves_literal_braces(self):
+        """Test that JSON and other literal braces in content survive substitution."""
+        task = {"content": 'Return {"name": "{SERVICE}", "tags": {}} and {0} or {{x}}'}
+        variables = {"SERVICE": "api"}
+        
+        prompt = Executor._build_user_prompt(self.repo_dir, task, variables)
+        
+        self.assertIn('Return {"name": "api", "tags": {}} and {0} or {{x}}', prompt)
+
+    def test_build_user_prompt_skips_duplicate_inputs(self):
+        """Test that repeated inputs and inputs already loaded in full are not previewed."""
+        for name in ("a.txt", "b.txt"):
+            Path(os.path.join(self.repo_dir, name)).write_text(f"content of {name}")
+        
+        task = {"inputs": ["a.txt", "/a.txt", "b.txt"]}
+        
+        prompt = Executor._build_user_prompt(self.repo_dir, task, {}, loaded_repo_paths={"/b.txt"})
+        
+        self.assertEqual(prompt.count("content of a.txt"), 1)
+        self.assertNotIn("content of b.txt", prompt)
+
     def test_build_user_prompt_no_content(self):
         """Test user prompt building without content."""
         # Create a file so repo structure is not empty
         repo_file = os.path.join(self.repo_dir, "test.txt")
-        with open(repo_file, "w") as f:
-            f.write("Test")
+        Path(repo_file).write_text("Test")
         
         task = {}
         variables = {}
@@ -196,23 +281,11 @@ Task for {SERVICE} service.
     def test_execute_task_invalid_response(self):
         """Test handling of invalid LLM response."""
         # Create a mock client that returns invalid response
-        mock_client = Mock()
+        mock_client = self.mock_client
         mock_client.complete.return_value = "Invalid response without markers"
         
-        # Create task file
-        task_file = os.path.join(self.tasks_dir, "test_task.md")
-        with open(task_file, "w") as f:
-            f.write("""---
-description: Test task
-context: []
-outputs: []
-guarantees: []
----
-Test content.
-""")
-        
         with self.assertRaises(ValueError):
-            Executor.execute_task(self.repo_dir, "test_task", self.context_dir, llm_client=mock_client)
+            Executor.execute_task(self.repo_dir, "test_task", self.shared_context_dir, llm_client=mock_client)
 
 
 if __name__ == "__main__":
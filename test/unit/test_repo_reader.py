@@ -3,75 +3,114 @@ import unittest
 import os
 import sys
 import tempfile
-import shutil
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+from collections import OrderedDict
+from unittest.mock import patch
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+import repo_reader
 from repo_reader import RepoReader
 
 
-class TestRepoReader(unittest.TestCase):
-    """Tests for RepoReader class."""
+def _mk_files(root, tree):
+    """Write {relative path: bytes} under root, creating each parent directory once."""
+    last_parent = None
+    for rel_path in sorted(tree):
+        full_path = os.path.join(root, rel_path)
+        parent = os.path.dirname(full_path)
+        if parent != last_parent:
+            os.makedirs(parent, exist_ok=True)
+            last_parent = parent
+        fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, tree[rel_path])
+        finally:
+            os.close(fd)
+
+
+def _fast_rmtree(path):
+    """Remove a test directory tree, taking entry types from scandir instead of stat calls."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
 
-    def setUp(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_dir = os.path.join(self.temp_dir, "repo")
-        os.makedirs(self.repo_dir)
 
-    def tearDown(self):
-        """Clean up after tests."""
-        shutil.rmtree(self.temp_dir)
+class TestRepoReaderReads(unittest.TestCase):
+    """Tests for RepoReader reads and listings that share read-only repositories."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the repositories once; these tests never modify them."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.addClassCleanup(_fast_rmtree, cls.temp_dir)
+        cls.repo_dir = os.path.join(cls.temp_dir, "repo")
+        _mk_files(cls.repo_dir, {
+            "test.txt": b"Hello, World!",
+            "subdir/nested.txt": b"Nested content",
+            "binary.txt": b"ok \xff end",
+            "short.txt": b"short",
+            "crlf.txt": b"one\r\ntwo\r\n",
+            "long.txt": ("é" * 1000).encode("utf-8"),
+        })
+        # A flat repository for listings that assert on the exact set of files
+        cls.flat_repo_dir = os.path.join(cls.temp_dir, "flat")
+        _mk_files(cls.flat_repo_dir, dict.fromkeys(["file1.txt", "file2.txt", "file3.py"], b"content"))
 
     def test_read_file(self):
         """Test reading a file from repository."""
-        # Create a test file
-        test_file = os.path.join(self.repo_dir, "test.txt")
-        test_content = "Hello, World!"
-        with open(test_file, "w") as f:
-            f.write(test_content)
-        
         content = RepoReader.read_file(self.repo_dir, "test.txt")
         
-        self.assertEqual(content, test_content)
+        self.assertEqual(content, "Hello, World!")
 
     def test_read_file_with_leading_slash(self):
         """Test reading file with leading slash in path."""
-        test_file = os.path.join(self.repo_dir, "test.txt")
-        test_content = "Hello, World!"
-        with open(test_file, "w") as f:
-            f.write(test_content)
-        
         content = RepoReader.read_file(self.repo_dir, "/test.txt")
         
-        self.assertEqual(content, test_content)
+        self.assertEqual(content, "Hello, World!")
 
     def test_read_file_nested(self):
         """Test reading a nested file."""
-        nested_dir = os.path.join(self.repo_dir, "subdir")
-        os.makedirs(nested_dir)
-        test_file = os.path.join(nested_dir, "nested.txt")
-        test_content = "Nested content"
-        with open(test_file, "w") as f:
-            f.write(test_content)
-        
         content = RepoReader.read_file(self.repo_dir, "subdir/nested.txt")
         
-        self.assertEqual(content, test_content)
+        self.assertEqual(content, "Nested content")
 
     def test_read_file_not_found(self):
         """Test reading non-existent file raises FileNotFoundError."""
         with self.assertRaises(FileNotFoundError):
             RepoReader.read_file(self.repo_dir, "nonexistent.txt")
 
+    def test_read_file_invalid_utf8(self):
+        """Test that invalid UTF-8 bytes are replaced rather than raising."""
+        self.assertEqual(RepoReader.read_file(self.repo_dir, "binary.txt"), "ok \ufffd end")
+
+    def test_read_file_normalizes_crlf(self):
+        """Test that CRLF line endings become LF, as a text-mode read would return them."""
+        self.assertEqual(RepoReader.read_file(self.repo_dir, "crlf.txt"), "one\ntwo\n")
+
+    def test_read_file_preview_short_file(self):
+        """Test that a short file is returned whole without ellipsis."""
+        self.assertEqual(RepoReader.read_file_preview(self.repo_dir, "short.txt"), "short")
+
+    def test_read_file_preview_truncates(self):
+        """Test that a long file is truncated to max_chars with ellipsis."""
+        preview = RepoReader.read_file_preview(self.repo_dir, "long.txt", max_chars=10)
+        
+        self.assertEqual(preview, "é" * 10 + "...")
+
+    def test_read_file_preview_not_found(self):
+        """Test previewing non-existent file raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            RepoReader.read_file_preview(self.repo_dir, "nonexistent.txt")
+
     def test_list_files(self):
         """Test listing files in repository."""
-        # Create multiple files
         files = ["file1.txt", "file2.txt", "file3.py"]
-        for filename in files:
-            filepath = os.path.join(self.repo_dir, filename)
-            with open(filepath, "w") as f:
-                f.write("content")
         
-        listed_files = RepoReader.list_files(self.repo_dir)
+        listed_files = RepoReader.list_files(self.flat_repo_dir)
         
         self.assertEqual(len(listed_files), len(files))
         for filename in files:
@@ -79,32 +118,46 @@ class TestRepoReader(unittest.TestCase):
 
     def test_list_files_with_pattern(self):
         """Test listing files with pattern filter."""
-        # Create files with different extensions
-        files = ["file1.txt", "file2.txt", "file3.py"]
-        for filename in files:
-            filepath = os.path.join(self.repo_dir, filename)
-            with open(filepath, "w") as f:
-                f.write("content")
-        
-        txt_files = RepoReader.list_files(self.repo_dir, pattern=".txt")
+        txt_files = RepoReader.list_files(self.flat_repo_dir, pattern=".txt")
         
         self.assertEqual(len(txt_files), 2)
         self.assertIn("file1.txt", txt_files)
         self.assertIn("file2.txt", txt_files)
         self.assertNotIn("file3.py", txt_files)
 
-    def test_list_files_in_directory(self):
-        """Test listing files in specific directory."""
-        subdir = os.path.join(self.repo_dir, "subdir")
-        os.makedirs(subdir)
+
+class TestRepoReader(unittest.TestCase):
+    """Tests for RepoReader listing and structure, each on a fresh repository."""
+
+    def setUp(self):
+        """Set up test environment."""
+        # Removed by a cleanup even if setUp fails later on
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(_fast_rmtree, self.temp_dir)
+        self.repo_dir = os.path.join(self.temp_dir, "repo")
+        os.makedirs(self.repo_dir)
+
+    def _mk_files(self, tree):
+        """Write {relative path: bytes} into this test's repository."""
+        _mk_files(self.repo_dir, tree)
+
+    def test_list_files_with_multiple_patterns(self):
+        """Test listing files matching any of several glob or substring patterns."""
+        self._mk_files(dict.fromkeys(["app.py", "README.md", "Dockerfile", "notes.txt", "setup.cfg"], b"content"))
         
-        root_file = os.path.join(self.repo_dir, "root.txt")
-        sub_file = os.path.join(subdir, "sub.txt")
+        files = RepoReader.list_files(self.repo_dir, pattern=["*.py", "*.md", "Dockerfile"])
         
-        with open(root_file, "w") as f:
-            f.write("root")
-        with open(sub_file, "w") as f:
-            f.write("sub")
+        self.assertEqual(files, ["Dockerfile", "README.md", "app.py"])
+
+    def test_list_files_glob_matches_whole_name(self):
+        """Test that a glob pattern must match the whole file name."""
+        self._mk_files({"app.py": b"content", "app.pyc": b"content"})
+        
+        self.assertEqual(RepoReader.list_files(self.repo_dir, pattern="*.py"), ["app.py"])
+
+    def test_list_files_in_directory(self):
+        """Test listing files in specific directory."""
+        self._mk_files({"root.txt": b"root", "subdir/sub.txt": b"sub"})
         
         subdir_files = RepoReader.list_files(self.repo_dir, "subdir")
         
@@ -117,19 +170,25 @@ class TestRepoReader(unittest.TestCase):
         
         self.assertEqual(files, [])
 
+    def test_list_files_skips_vcs_and_dependency_dirs(self):
+        """Test that .git, node_modules and __pycache__ are not listed."""
+        self._mk_files({
+            f"{dirname}/file.txt": b"content"
+            for dirname in [".git", "node_modules", "__pycache__", "src"]
+        })
+        
+        self.assertEqual(RepoReader.list_files(self.repo_dir), ["src/file.txt"])
+
+    def test_list_files_path_is_a_file(self):
+        """Test listing a directory that is actually a file returns empty list."""
+        self._mk_files({"file.txt": b"content"})
+        
+        self.assertEqual(RepoReader.list_files(self.repo_dir, "file.txt"), [])
+
     def test_get_repo_structure(self):
         """Test getting repository structure."""
         # Create a simple structure
-        subdir = os.path.join(self.repo_dir, "subdir")
-        os.makedirs(subdir)
-        
-        file1 = os.path.join(self.repo_dir, "file1.txt")
-        file2 = os.path.join(subdir, "file2.txt")
-        
-        with open(file1, "w") as f:
-            f.write("content1")
-        with open(file2, "w") as f:
-            f.write("content2")
+        self._mk_files({"file1.txt": b"content1", "subdir/file2.txt": b"content2"})
         
         structure = RepoReader.get_repo_structure(self.repo_dir)
         
@@ -151,13 +210,7 @@ class TestRepoReader(unittest.TestCase):
 
     def test_get_repo_structure_hides_dotfiles(self):
         """Test that dotfiles are hidden from structure."""
-        dotfile = os.path.join(self.repo_dir, ".hidden")
-        normal_file = os.path.join(self.repo_dir, "visible.txt")
-        
-        with open(dotfile, "w") as f:
-            f.write("hidden")
-        with open(normal_file, "w") as f:
-            f.write("visible")
+        self._mk_files({".hidden": b"hidden", "visible.txt": b"visible"})
         
         structure = RepoReader.get_repo_structure(self.repo_dir)
         
@@ -165,6 +218,52 @@ class TestRepoReader(unittest.TestCase):
         # .hidden should not be in structure
         self.assertNotIn(".hidden", structure)
 
+    def test_get_repo_structure_cache_invalidated_on_change(self):
+        """Test that adding a top-level entry invalidates the cached structure."""
+        self._mk_files({"first.txt": b"first"})
+        
+        structure = RepoReader.get_repo_structure(self.repo_dir)
+        self.assertNotIn("second.txt", structure)
+        
+        # Force a distinct directory mtime even on coarse-grained filesystems
+        self._mk_files({"second.txt": b"second"})
+        st = os.stat(self.repo_dir)
+        os.utime(self.repo_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        
+        structure = RepoReader.get_repo_structure(self.repo_dir)
+        self.assertIn("second.txt", structure)
+        
+        # The stale entry is replaced rather than kept alongside the new one
+        abs_root = os.path.abspath(self.repo_dir)
+        self.assertEqual(len([key for key in repo_reader._STRUCTURE_CACHE if key[0] == abs_root]), 1)
+
+    def test_get_repo_structure_cache_evicts_least_recently_used(self):
+        """Test that the structure cache is bounded and evicts the least recently used repository."""
+        roots = []
+        for name in ["a", "b", "c"]:
+            roots.append(os.path.abspath(os.path.join(self.repo_dir, name)))
+            os.makedirs(roots[-1])
+        
+        with patch.object(repo_reader, "_STRUCTURE_CACHE_MAXSIZE", 2), \
+                patch.object(repo_reader, "_STRUCTURE_CACHE", OrderedDict()):
+            for root in [roots[0], roots[1], roots[0], roots[2]]:
+                RepoReader.get_repo_structure(root)
+            
+            self.assertEqual([key[0] for key in repo_reader._STRUCTURE_CACHE], [roots[0], roots[2]])
+
+    def test_render_repo_structure(self):
+        """Test rendering the structure as an indented listing."""
+        os.makedirs(os.path.join(self.repo_dir, "subdir", "deeper"))
+        self._mk_files({"file1.txt": b"content1", "subdir/file2.txt": b"content2", ".hidden": b"hidden"})
+        
+        rendered = RepoReader.render_repo_structure(self.repo_dir, max_depth=1)
+        
+        self.assertEqual(rendered, "file1.txt\nsubdir/\n  deeper/\n  file2.txt\n")
+
+    def test_render_repo_structure_empty_repo(self):
+        """Test that an empty repository renders as an empty string."""
+        self.assertEqual(RepoReader.render_repo_structure(self.repo_dir), "")
+
 
 if __name__ == "__main__":
     unittest.main()